@@ -2,9 +2,13 @@
 
 from math import ceil, log2
 from random import randint
+from typing import Any, Callable, NamedTuple, Optional
 
+import cocotb
+from cocotb.result import SimTimeoutError
 from cocotb.runner import check_results_file, get_runner
-from cocotb.triggers import ClockCycles, FallingEdge, RisingEdge, with_timeout
+from cocotb.triggers import ClockCycles, Edge, FallingEdge, First, RisingEdge, Timer
+from cocotb.utils import get_sim_steps, get_sim_time
 
 
 async def toggle(clk, signal, cycles=1):
@@ -35,25 +39,95 @@ async def reset_n(clk, rst, cycles=1):
     await _reset(clk, rst, cycles, active_low=True)
 
 
+class WaitMatch(NamedTuple):
+    # Clock cycle of the match counted from the call, None if waited without a clock
+    cycle: Optional[int]
+    # Simulation time of the match in ns
+    time: float
+
+
+async def wait_for(
+    signal,
+    predicate: Callable[[Any], bool],
+    timeout: Optional[int] = None,
+    units: str = "step",
+    clk=None,
+) -> WaitMatch:
+    """
+    Wait until 'predicate' holds for the value of 'signal'. Instead of waking up every
+    clock cycle, sleeps until 'signal' changes or 'timeout' expires. If 'clk' is given,
+    'signal' is sampled on its rising edges like in a polling loop & 'timeout' may also be
+    given in "cycles". The clock period is measured on the first edges of each call.
+    Raises SimTimeoutError if 'predicate' doesn't hold within 'timeout'.
+    """
+    if units == "cycles" and clk is None:
+        raise ValueError("Timeout in cycles requires a clock")
+
+    # Verilator evaluates the model before RisingEdge callbacks, so signals changed by
+    # a clock edge change in the callback batch of that edge
+    same_batch = "verilator" in (getattr(cocotb, "SIM_NAME", None) or "").lower()
+
+    start = get_sim_time("step")
+    deadline = None
+    if timeout is not None and units != "cycles":
+        deadline = start + get_sim_steps(timeout, units)
+    period = None
+    last_edge = None
+    cycle = 0
+
+    while True:
+        now = get_sim_time("step")
+        if units == "cycles" and timeout is not None:
+            over, expired = cycle > timeout, cycle >= timeout
+            if period is not None:
+                deadline = last_edge + (timeout - cycle) * period
+        else:
+            over = deadline is not None and now > deadline
+            expired = deadline is not None and now >= deadline
+        if not over and predicate(signal.value):
+            return WaitMatch(cycle if clk is not None else None, get_sim_time("ns"))
+        if expired:
+            raise SimTimeoutError(f"Timeout waiting for {signal._name}")
+
+        # Until the clock period is known, wait for its consecutive edges to measure it
+        fired = None
+        if clk is None or period is not None:
+            triggers = [Edge(signal)]
+            if deadline is not None:
+                triggers.append(Timer(max(deadline - now, 1), "step"))
+            fired = await First(*triggers)
+        if clk is None:
+            continue
+
+        now = get_sim_time("step")
+        # A change in the batch of a clock edge is sampled in that cycle, as awaiting the
+        # edge would skip to the next one
+        on_edge = period is not None and now > last_edge and (now - last_edge) % period == 0
+        if not (same_batch and on_edge and isinstance(fired, Edge)):
+            await RisingEdge(clk)
+            now = get_sim_time("step")
+        if period is None:
+            if last_edge is not None:
+                period = now - last_edge
+            cycle += 1
+        else:
+            cycle += round((now - last_edge) / period)
+        last_edge = now
+
+
 async def timeout(clk, signal, exp_val, timeout_threshold):
     """
     TODO: this function duplicates functionality of expect_with_timeout,
     but is used, so we will have to refactor tests before dropping it
     """
-    timeout = 0
-    while signal.value != exp_val:
-        timeout += 1
-        await RisingEdge(clk)
-        if timeout > timeout_threshold:
-            raise TimeoutError(f"timeout {signal.name}")
+    try:
+        await wait_for(signal, lambda value: value == exp_val, timeout_threshold, "cycles", clk)
+    except SimTimeoutError:
+        raise TimeoutError(f"timeout {signal.name}")
 
 
 async def expect_with_timeout(signal, expected, clk, timeout: int = 2, units: str = "ms"):
-    async def wait_cond():
-        while signal.value != expected:
-            await RisingEdge(clk)
-
-    await with_timeout(wait_cond(), timeout, units)
+    return await wait_for(signal, lambda value: value == expected, timeout, units, clk)
 
 
 def clog2(val: int):
@@ -1,10 +1,22 @@
 # SPDX-License-Identifier: Apache-2.0
 
+import fcntl
+import functools
+import hashlib
+import json
 import logging
 import os
 import re
-from xml.etree import ElementTree
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, Callable, Iterator
+from xml.etree import ElementTree
 
 """
 Common functions and utilities for noxfile.py
@@ -27,16 +39,88 @@ def sim_repeater_path():
 
 def setupLogger(verbose=False, filename="setup_logger.log"):
     logger = logging.getLogger()
-    logHandler = logging.FileHandler(filename=filename, mode="w", encoding="utf-8")
-    logFormatter = logging.Formatter()
-    logHandler.setFormatter(logFormatter)
-    logger.addHandler(logHandler)
+    path = os.path.abspath(filename)
+    # Reuse the handler from previous calls, so that messages aren't logged multiple times
+    for logHandler in logger.handlers:
+        if isinstance(logHandler, logging.FileHandler) and logHandler.baseFilename == path:
+            break
+    else:
+        logHandler = logging.FileHandler(filename=filename, mode="w", encoding="utf-8")
+        logFormatter = logging.Formatter()
+        logHandler.setFormatter(logFormatter)
+        logger.addHandler(logHandler)
     logHandler.setLevel(logging.INFO)
     if verbose:
         logHandler.setLevel(logging.DEBUG)
     return logger
 
 
+@dataclass
+class TestCaseResult:
+    name: str
+    classname: str
+    file: str
+    lineno: str
+    # Wall time in seconds
+    time: float
+    # Simulated time in nanoseconds
+    sim_time: float
+    failure: str | None = None
+    skipped: bool = False
+
+    @property
+    def ratio(self) -> float:
+        """
+        Simulated nanoseconds per wall clock second
+        """
+        return self.sim_time / self.time if self.time else 0.0
+
+
+_results_cache: dict[str, tuple[tuple[int, int], list[TestCaseResult]]] = {}
+_results_cache_lock = threading.Lock()
+
+
+def parse_results(resultsFile="results.xml") -> list[TestCaseResult]:
+    """
+    Read test cases from cocotb results.xml file.
+
+    The file is parsed incrementally and parsed results are cached until the file changes,
+    so checking the same results for failures, timings and reports reads it only once.
+    """
+    path = os.path.abspath(resultsFile)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _results_cache_lock:
+        cached = _results_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    testcases = []
+    for _, elem in ElementTree.iterparse(path, events=("end",)):
+        if elem.tag != "testcase":
+            continue
+        failure = elem.find("failure")
+        if failure is None:
+            failure = elem.find("error")
+        testcases.append(
+            TestCaseResult(
+                name=elem.get("name", ""),
+                classname=elem.get("classname", ""),
+                file=elem.get("file", ""),
+                lineno=elem.get("lineno", ""),
+                time=float(elem.get("time", 0)),
+                sim_time=float(elem.get("sim_time_ns", 0)),
+                failure=None if failure is None else (failure.get("message") or failure.text or ""),
+                skipped=elem.find("skipped") is not None,
+            )
+        )
+        elem.clear()
+
+    with _results_cache_lock:
+        _results_cache[path] = (stamp, testcases)
+    return testcases
+
+
 def isCocotbSimFailure(resultsFile="results.xml", suppress_return_code=False, verbose=True):
     """
     Extract failure code from cocotb results.xml file
@@ -44,8 +128,7 @@ def isCocotbSimFailure(resultsFile="results.xml", suppress_return_code=False, ve
     setupLogger(verbose)
     logging.debug(f"Reading file {resultsFile}")
 
-    tree = ElementTree.parse(resultsFile)
-    found_fail = tree.findall(".//failure")
+    found_fail = [tc.name for tc in parse_results(resultsFile) if tc.failure is not None]
     return_code = 0 if suppress_return_code else found_fail != []
 
     logging.debug(f"Failures: {found_fail}")
@@ -54,6 +137,274 @@ def isCocotbSimFailure(resultsFile="results.xml", suppress_return_code=False, ve
     return return_code
 
 
+def get_random_seed(resultsFile="results.xml") -> int | None:
+    """
+    Get the seed of Python's random module cocotb has used in the run of results.xml file.
+    Returns None if the file does not exist or doesn't record the seed.
+    """
+    try:
+        for _, elem in ElementTree.iterparse(resultsFile, events=("end",)):
+            if elem.tag == "property" and elem.get("name") == "random_seed":
+                return int(elem.get("value"))
+    except (OSError, ElementTree.ParseError, TypeError, ValueError):
+        pass
+    return None
+
+
+def get_test_timings(resultsFile="results.xml") -> dict[str, dict[str, float]]:
+    """
+    Get wall time (in seconds) and simulated time (in nanoseconds) of each test case
+    in cocotb results.xml file. Returns empty dict if the file does not exist.
+    """
+    try:
+        testcases = parse_results(resultsFile)
+    except (OSError, ElementTree.ParseError):
+        return {}
+    return {tc.name: {"time": tc.time, "sim_time": tc.sim_time} for tc in testcases}
+
+
+def get_test_duration(resultsFile="results.xml") -> float | None:
+    """
+    Get total wall time (in seconds) of the test cases in cocotb results.xml file.
+    Returns None if the file does not exist or holds no timing information.
+    """
+    timings = get_test_timings(resultsFile)
+    return sum(t["time"] for t in timings.values()) if timings else None
+
+
+class ResultsReport:
+    """
+    Single JUnit report merging results of all tests.
+
+    Results of each test are added as they become available, as a `testsuite` named after
+    the test, holding per test case timings, failure messages and simulated time to wall
+    time ratios. Results of tests which aren't run again are kept in the report. The report
+    is updated under a file lock, so it can be shared by concurrently running nox sessions.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._suites: dict[str, ElementTree.Element] = {}
+        # Stamp of the report when it was last read or written by this process
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        if not os.path.isfile(self.path):
+            return None
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(f"{self.path}.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        stamp = self._file_stamp()
+        # Reread the report only if it has been updated by another process
+        if stamp == self._stamp:
+            return
+        self._suites = {}
+        if stamp is not None:
+            try:
+                root = ElementTree.parse(self.path).getroot()
+            except ElementTree.ParseError:
+                root = ElementTree.Element("testsuites")
+            for suite in root.iter("testsuite"):
+                self._suites[suite.get("name")] = suite
+        self._stamp = stamp
+
+    def _write(self):
+        root = ElementTree.Element("testsuites", name="results")
+        totals = {"tests": 0, "failures": 0, "skipped": 0, "time": 0.0}
+        for name in sorted(self._suites):
+            suite = self._suites[name]
+            root.append(suite)
+            for key in totals:
+                totals[key] += type(totals[key])(suite.get(key, 0))
+        for key, value in totals.items():
+            root.set(key, str(value))
+        ElementTree.indent(root)
+
+        tmp = f"{self.path}.tmp"
+        ElementTree.ElementTree(root).write(tmp, encoding="utf-8", xml_declaration=True)
+        os.replace(tmp, self.path)
+        self._stamp = self._file_stamp()
+
+    @staticmethod
+    def _make_suite(name: str, resultsFile: str, testcases: list[TestCaseResult]):
+        time = sum(tc.time for tc in testcases)
+        sim_time = sum(tc.sim_time for tc in testcases)
+        suite = ElementTree.Element(
+            "testsuite",
+            name=name,
+            file=resultsFile,
+            tests=str(len(testcases)),
+            failures=str(sum(tc.failure is not None for tc in testcases)),
+            skipped=str(sum(tc.skipped for tc in testcases)),
+            time=f"{time:.3f}",
+            sim_time_ns=f"{sim_time:.3f}",
+            ratio_time=f"{sim_time / time if time else 0.0:.3f}",
+        )
+        for tc in testcases:
+            case = ElementTree.SubElement(
+                suite,
+                "testcase",
+                name=tc.name,
+                classname=tc.classname,
+                file=tc.file,
+                lineno=tc.lineno,
+                time=f"{tc.time:.3f}",
+                sim_time_ns=f"{tc.sim_time:.3f}",
+                ratio_time=f"{tc.ratio:.3f}",
+            )
+            if tc.failure is not None:
+                ElementTree.SubElement(case, "failure", message=tc.failure)
+            if tc.skipped:
+                ElementTree.SubElement(case, "skipped")
+        return suite
+
+    def add(self, name: str, resultsFile: str) -> list[TestCaseResult]:
+        """
+        Add results of test `name` from cocotb results file to the report
+        """
+        testcases = parse_results(resultsFile)
+        suite = self._make_suite(name, os.path.abspath(resultsFile), testcases)
+        with self._lock, self._file_lock():
+            self._load()
+            self._suites[name] = suite
+            self._write()
+        return testcases
+
+
+def load_durations(path: str) -> dict[str, float]:
+    """
+    Load test durations saved with `save_durations`
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_durations(path: str, durations: dict[str, float]):
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+class DurationDB:
+    """
+    Persistent database of test durations stored in a JSON file.
+
+    For each test it holds the wall time and simulated time of its test cases from the
+    last passing run. Updates are done under a file lock, so the database can be shared
+    by concurrently running tests and nox sessions.
+    """
+
+    def __init__(self, path: str, threshold: float = 1.5, min_time: float = 1.0):
+        self.path = path
+        # Test case is reported as slower if its wall time exceeds the previous one
+        # multiplied by `threshold` by more than `min_time` seconds
+        self.threshold = threshold
+        self.min_time = min_time
+
+    def load(self) -> dict:
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def durations(self) -> dict[str, float]:
+        """
+        Get total wall time of each test
+        """
+        return {name: entry["time"] for name, entry in self.load().items()}
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        with open(f"{self.path}.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def record(self, name: str, resultsFile: str) -> list[str]:
+        """
+        Store timings of test `name` from cocotb results file.
+        Returns descriptions of test cases that became slower since the previous run.
+        """
+        timings = get_test_timings(resultsFile)
+        if not timings:
+            return []
+
+        with self._lock():
+            db = self.load()
+            previous = db.get(name, {}).get("testcases", {})
+            db[name] = {
+                "time": sum(t["time"] for t in timings.values()),
+                "sim_time": sum(t["sim_time"] for t in timings.values()),
+                "testcases": timings,
+            }
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(db, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+        regressions = []
+        for testcase, timing in timings.items():
+            if testcase not in previous:
+                continue
+            old = previous[testcase]
+            if timing["time"] > old["time"] * self.threshold + self.min_time:
+                regressions.append(
+                    f"{name}::{testcase}: wall time {old['time']:.2f}s -> {timing['time']:.2f}s,"
+                    f" sim time {old['sim_time']:.0f}ns -> {timing['sim_time']:.0f}ns"
+                )
+        return regressions
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Parse `k/N` shard specification, `k` is counted from 1
+    """
+    match = re.fullmatch(r"(\d+)/(\d+)", shard)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Invalid shard '{shard}', expected 'k/N' with 1 <= k <= N")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_jobs(jobs: list["Job"], durations: dict[str, float], shard: int, shards: int):
+    """
+    Split jobs into `shards` parts of similar total duration and return the part number `shard`.
+
+    Jobs are assigned longest first, each to the part with the shortest total duration so far.
+    Jobs of unknown duration are assumed to take as long as an average known job. The split
+    depends only on job names and durations, so all shards have to be given the same durations.
+    """
+    known = [durations[job.name] for job in jobs if job.name in durations]
+    default = sum(known) / len(known) if known else 1.0
+
+    def duration(job):
+        return durations.get(job.name, default)
+
+    totals = [0.0] * shards
+    parts = [[] for _ in range(shards)]
+    for job in sorted(jobs, key=lambda job: (-duration(job), job.name)):
+        idx = totals.index(min(totals))
+        totals[idx] += duration(job)
+        parts[idx].append(job)
+
+    selected = set(id(job) for job in parts[shard - 1])
+    # Keep the original order of jobs
+    return [job for job in jobs if id(job) in selected]
+
+
 def find_match(string, pattern):
     """
     This function looks for patterns in simulation logs:
@@ -92,21 +443,43 @@ class VerificationTest:
     Useful to manage files produced by Cocotb+Verilator in I3C_ROOT_DIR/verification/block
     """
 
-    def __init__(self, blockName: str, blockPath: str, testName: str, coverage: str | None, pfx=""):
+    def __init__(
+        self,
+        blockName: str,
+        blockPath: str,
+        testName: str,
+        coverage: str | None,
+        pfx="",
+        isolated=False,
+    ):
         self.blockName = blockName
         self.blockPath = blockPath
         self.testName = testName
         self.coverage = coverage
         self.pfx = pfx
+        self.isolated = isolated
+        self.shared_model = False
         self.testPath = os.path.join(blockPath, blockName)
-        self.sim_build = "sim_build" if coverage is None else f"sim_build-{self.testName}-{coverage}"
+        if isolated:
+            # Test runs concurrently with others from the same directory, give it its own
+            # build directory and run the simulation in it, so that default outputs of
+            # the simulator are not overwritten by other tests
+            self.sim_build = f"sim_build-{self.testName}{pfx}"
+            if coverage is not None:
+                self.sim_build += f"-{coverage}"
+            self.run_dir = self.sim_build
+        else:
+            self.sim_build = (
+                "sim_build" if coverage is None else f"sim_build-{self.testName}-{coverage}"
+            )
+            self.run_dir = ""
 
         # Convert NoneType to empty string
         coverage = "" if coverage is None else str(coverage)
 
         # Defaults from verilator
-        defaultNameVCD = "dump.vcd"
-        defaultNameCoverage = "coverage.dat"
+        defaultNameVCD = os.path.join(self.run_dir, "dump.vcd")
+        defaultNameCoverage = os.path.join(self.run_dir, "coverage.dat")
         defaultTestNameLog = f"{self.testName}{pfx}.log"
         defaultNameVDB = f"{self.sim_build}/simv.vdb"
 
@@ -143,6 +516,16 @@ class VerificationTest:
             "vdb": get_path(testNameVDB),
         }
 
+    @property
+    def name(self) -> str:
+        """
+        Unique name of the test run, e.g. `i3c_ctrl/test_enter_ddr_01 (branch)`
+        """
+        name = f"{self.blockName}/{self.testName}{self.pfx}"
+        if self.coverage:
+            name += f" ({self.coverage})"
+        return name
+
     def rename_default(self, dest: str):
         source = self.paths[f"{dest}_default"]
         if (not os.path.isfile(source)) and (not os.path.isdir(source)):
@@ -150,14 +533,531 @@ class VerificationTest:
             return
         os.rename(source, self.paths[dest])
 
-    def rename_defaults(self, coverage: str | None, simulator: str | None):
+    def rename_defaults(self, coverage: str | None, simulator: str | None, vcd=True):
         if coverage:
             self.rename_default("log")
             if simulator is not None and "vcs" in simulator:
                 self.rename_default("vdb")
             else:
                 self.rename_default("cov")
-        self.rename_default("vcd")
+        if vcd:
+            self.rename_default("vcd")
+
+    def use_model(self, sim_build: str):
+        """
+        Build the test in (or reuse the model from) `sim_build` instead of its own directory
+        """
+        self.sim_build = sim_build
+        self.shared_model = True
+        self.filenames["vdb_default"] = f"{sim_build}/simv.vdb"
+        self.paths["vdb_default"] = os.path.join(self.testPath, self.filenames["vdb_default"])
+
+    def make_args(self) -> list[str]:
+        """
+        Make variables placing the test build and simulation outputs in locations
+        described by this object
+        """
+        args = ["COCOTB_RESULTS_FILE=" + self.filenames["xml"]]
+        if self.isolated or self.shared_model:
+            args.append("SIM_BUILD=" + self.sim_build)
+        if self.isolated:
+            args.append("RUN_DIR=" + self.run_dir)
+        return args
+
+    def config_stamp(self) -> str:
+        """
+        Path of the file marking that the I3C configuration has been generated for the test
+        """
+        return os.path.abspath(os.path.join(self.testPath, "sim_build", "i3c_config.vh"))
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, mtime_ns: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+class ModelCache:
+    """
+    Content-addressed cache of compiled simulation models.
+
+    Models are keyed by a hash of everything their build depends on: contents of Verilog sources
+    (including files listed in filelists and found in include directories), I3C configuration,
+    toplevel, simulator and its arguments. Tests building identical models, e.g. the same toplevel
+    from different test modules, sessions or iterations, share a single compiled model.
+    """
+
+    SOURCE_SUFFIXES = (".sv", ".svh", ".v", ".vh")
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def model_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def is_built(self, key: str) -> bool:
+        return os.path.isfile(os.path.join(self.model_dir(key), ".built"))
+
+    def mark_built(self, key: str):
+        Path(self.model_dir(key), ".built").touch()
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Exclusive access to the cache entry, held while the model is being built
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, f"{key}.lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def key(self, test_path: str, make_args: list[str]) -> str:
+        """
+        Compute cache key of the model built by `make -C test_path build <make_args>`
+        """
+        out = subprocess.run(
+            ["make", "-s", "-C", test_path, "print-build-inputs", *make_args],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        digest = hashlib.sha256()
+        for line in out.splitlines():
+            if not line.startswith("BUILD_INPUT "):
+                continue
+            name, _, value = line.removeprefix("BUILD_INPUT ").partition("=")
+            digest.update(name.encode())
+            self._hash_args(digest, value.split(), test_path)
+        return digest.hexdigest()[:16]
+
+    def _hash_file(self, digest, path: str):
+        # Only the name and contents matter, so that models built from the same sources
+        # in different locations (e.g. test directories) share the key
+        stat = os.stat(path)
+        digest.update(os.path.basename(path).encode())
+        digest.update(_file_digest(path, stat.st_mtime_ns, stat.st_size))
+
+    def _hash_dir(self, digest, path: str):
+        if not os.path.isdir(path):
+            return
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith(self.SOURCE_SUFFIXES):
+                self._hash_file(digest, entry.path)
+
+    def _hash_filelist(self, digest, path: str, cwd: str):
+        # Paths in filelists are relative to the working directory of the simulator
+        with open(path, "r") as f:
+            args = []
+            for line in f:
+                args += os.path.expandvars(line.split("//")[0]).split()
+        self._hash_args(digest, args, cwd)
+
+    def _hash_args(self, digest, args: list[str], cwd: str):
+        def resolve(path):
+            return os.path.normpath(os.path.join(cwd, path))
+
+        args = iter(args)
+        for arg in args:
+            if os.path.isfile(resolve(arg)):
+                self._hash_file(digest, resolve(arg))
+                continue
+
+            digest.update(arg.encode())
+            if arg == "-f":
+                self._hash_filelist(digest, resolve(next(args, "")), cwd)
+            elif arg == "-y":
+                self._hash_dir(digest, resolve(next(args, "")))
+            elif arg.startswith("+incdir+"):
+                for path in arg.removeprefix("+incdir+").split("+"):
+                    self._hash_dir(digest, resolve(path))
+
+
+class CoverageMerge:
+    """
+    Merges coverage databases of tests (Verilator `.dat` files or VCS `.vdb` directories)
+    in a parallel tree reduction, as the tests finish.
+
+    Tests expected to provide coverage are known up front and form leaves of a balanced
+    binary tree, so that the tree doesn't depend on the order in which tests finish. Each
+    node is merged as soon as both its children are available. Results of merges are kept
+    in `cache_dir`, keyed by hashes of their inputs, so that subtrees of unchanged inputs
+    are not merged again.
+
+    Merges run their commands in a registry of their own, so that stopping the scheduler
+    of the tests (e.g. on fail-fast) doesn't terminate them. A failing merge is logged
+    and replaced by one of its inputs, so that the partial coverage is kept.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        cache_dir: str,
+        simulator: str,
+        max_jobs: int,
+        log: Callable[[str], None] = print,
+    ):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.simulator = simulator
+        self.suffix = ".vdb" if simulator == "vcs" else ".dat"
+        self.log = log
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs))
+        self._processes = ProcessRegistry()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        # Errors of failed merges
+        self.errors = []
+
+        self._leaves = {name: i for i, name in enumerate(sorted(set(names)))}
+        # Nodes are identified by ranges of leaves they cover, values of nodes are pairs
+        # of hash and path of the merged database or None if the node has no coverage data
+        self._root = (0, len(self._leaves))
+        self._values: dict[tuple[int, int], tuple[str, str] | None] = {}
+        self._parents = {}
+        self._build(self._root)
+        if not self._leaves:
+            self._done.set()
+
+    def _build(self, node: tuple[int, int]):
+        lo, hi = node
+        if hi - lo <= 1:
+            return
+        mid = (lo + hi) // 2
+        for child in ((lo, mid), (mid, hi)):
+            self._parents[child] = node
+            self._build(child)
+
+    def add(self, name: str, path: str | None):
+        """
+        Provide coverage database of test `name`, None if the test has no coverage data
+        """
+        i = self._leaves[name]
+        value = None
+        if path is not None and os.path.exists(path):
+            digest = hashlib.sha256()
+            self._hash_db(digest, path)
+            value = (digest.hexdigest()[:16], os.path.abspath(path))
+        self._set((i, i + 1), value)
+
+    def _set(self, node: tuple[int, int], value: tuple[str, str] | None):
+        with self._lock:
+            if node in self._values:
+                return
+            self._values[node] = value
+            if node == self._root:
+                self._done.set()
+                return
+            parent = self._parents[node]
+            lo, hi = parent
+            mid = (lo + hi) // 2
+            children = [(lo, mid), (mid, hi)]
+            if not all(child in self._values for child in children):
+                return
+            inputs = [self._values[child] for child in children]
+
+        inputs = [i for i in inputs if i is not None]
+        if len(inputs) < 2:
+            self._set(parent, inputs[0] if inputs else None)
+            return
+        future = self._executor.submit(self._merge, inputs)
+        future.add_done_callback(functools.partial(self._merged, parent, inputs))
+
+    def _merged(self, node: tuple[int, int], inputs: list[tuple[str, str]], future):
+        error = future.exception()
+        if error is None:
+            self._set(node, future.result())
+            return
+        self.errors.append(error)
+        lost = ", ".join(path for _, path in inputs[1:])
+        self.log(f"Coverage merge failed: {error}, coverage of {lost} is left out")
+        self._set(node, inputs[0])
+
+    def _merge(self, inputs: list[tuple[str, str]]) -> tuple[str, str]:
+        key = hashlib.sha256("".join(k for k, _ in inputs).encode()).hexdigest()[:16]
+        output = os.path.join(self.cache_dir, key + self.suffix)
+        marker = os.path.join(self.cache_dir, f"{key}.merged")
+        if os.path.exists(marker):
+            return key, output
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = [path for _, path in inputs]
+        if self.simulator == "vcs":
+            args = ["urg", "-full64", "-dir", *paths, "-dbname", output, "-noreport"]
+        else:
+            args = ["verilator_coverage", "--write", output, *paths]
+        with open(os.path.join(self.cache_dir, f"{key}.log"), "w") as log:
+            run_logged(args, log, registry=self._processes)
+        Path(marker).touch()
+        return key, output
+
+    def _hash_db(self, digest, path: str):
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            digest.update(_file_digest(path, stat.st_mtime_ns, stat.st_size))
+            return
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                digest.update(os.path.relpath(os.path.join(root, name), path).encode())
+                self._hash_db(digest, os.path.join(root, name))
+
+    def finish(self) -> str | None:
+        """
+        Wait for the merge of all the tests, tests which haven't been added have no coverage.
+        Returns path of the merged database, None if no test has coverage data. The database
+        lacks coverage of the tests whose merges have failed, see `errors`.
+        """
+        for name, i in self._leaves.items():
+            if (i, i + 1) not in self._values:
+                self._set((i, i + 1), None)
+        self._done.wait()
+        self._executor.shutdown()
+        value = self._values.get(self._root)
+        return value[1] if value is not None else None
+
+    def report(self, database: str, output_dir: str):
+        """
+        Generate coverage report of the merged `database` in `output_dir`,
+        unless it has already been generated for the same database
+        """
+        key_file = os.path.join(output_dir, ".database")
+        if os.path.isfile(key_file):
+            with open(key_file, "r") as f:
+                if f.read() == database:
+                    self.log(f"Coverage report in {output_dir} is up to date")
+                    return
+
+        os.makedirs(output_dir, exist_ok=True)
+        if self.simulator == "vcs":
+            args = ["urg", "-full64", "-dir", database, "-report", output_dir]
+        else:
+            info = os.path.join(output_dir, "coverage.info")
+            args = ["verilator_coverage", "--write-info", info, database]
+        with open(os.path.join(output_dir, "report.log"), "w") as log:
+            run_logged(args, log, registry=self._processes)
+        with open(key_file, "w") as f:
+            f.write(database)
+
+
+def get_cfg_name(test_path: str) -> str:
+    """
+    Get name of the I3C configuration (CFG_NAME) the test in `test_path` is built with
+    """
+    pattern = re.compile(r"\s*(?:override\s+)?CFG_NAME\s*[:?]?=\s*(\S+)")
+    with open(os.path.join(test_path, "Makefile"), "r") as f:
+        for line in f:
+            match = pattern.match(line)
+            if match:
+                return match.group(1)
+    # Fall back to the default from common.mk
+    return os.getenv("CFG_NAME", "axi")
+
+
+@dataclass
+class Job:
+    """
+    A unit of work for `JobScheduler`
+
+    Jobs sharing a `phase` may run concurrently, different phases never overlap.
+    """
+
+    name: str
+    func: Callable[[], None]
+    phase: str = ""
+
+
+@dataclass
+class JobResult:
+    name: str
+    error: Exception | None = None
+    # Job hasn't been started or has been terminated after the scheduler had stopped
+    cancelled: bool = False
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and not self.cancelled
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class ProcessRegistry:
+    """
+    Tracks external commands run by jobs, so that they can be terminated when jobs are cancelled.
+
+    Each command is started in its own process group, which lets `terminate` stop the whole
+    process tree of the command, e.g. `sim_repeater.sh`, `make` and the simulator.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen] = set()
+        self.cancelled = False
+
+    def reset(self):
+        with self._lock:
+            self.cancelled = False
+
+    def popen(self, args: list[str], **kwargs) -> subprocess.Popen:
+        with self._lock:
+            if self.cancelled:
+                raise JobCancelled(f"Not started: {args}")
+            process = subprocess.Popen(args, start_new_session=True, **kwargs)
+            self._processes.add(process)
+        return process
+
+    def release(self, process: subprocess.Popen):
+        with self._lock:
+            self._processes.discard(process)
+
+    @staticmethod
+    def _signal(process: subprocess.Popen, sig: signal.Signals):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self, timeout: float = 10.0):
+        """
+        Terminate running commands and prevent new ones from being started.
+        Commands which don't exit within `timeout` seconds are killed.
+        """
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+
+        for process in processes:
+            self._signal(process, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                self._signal(process, signal.SIGKILL)
+                process.wait()
+
+
+# External commands run with `run_logged`
+processes = ProcessRegistry()
+
+
+class JobScheduler:
+    """
+    Runs jobs on a pool of `max_jobs` worker threads.
+
+    Jobs are executed phase by phase, in order of the first appearance of each phase.
+    Tests built with different I3C configurations regenerate the same RTL sources, so
+    such tests are put in separate phases. Optional `prepare` callback is called with
+    the phase name and its jobs before the phase starts.
+
+    After `max_failures` jobs have failed (or when interrupted) the scheduler stops:
+    jobs which haven't started are cancelled and commands run by the running jobs
+    with `run_logged` are terminated.
+    """
+
+    def __init__(
+        self,
+        max_jobs: int,
+        prepare: Callable[[str, list[Job]], None] | None = None,
+        log: Callable[[str], None] = print,
+        max_failures: int | None = None,
+    ):
+        self.max_jobs = max(1, max_jobs)
+        self.prepare = prepare
+        self.log = log
+        self.max_failures = max_failures
+        self.failures = 0
+        self.stopped = False
+
+    def run(self, jobs: list[Job]) -> list[JobResult]:
+        phases = {}
+        for job in jobs:
+            phases.setdefault(job.phase, []).append(job)
+
+        processes.reset()
+        self.failures = 0
+        self.stopped = False
+        results = []
+        for phase, phase_jobs in phases.items():
+            if self.stopped:
+                for job in phase_jobs:
+                    self.log(f"Cancelled: {job.name}")
+                    results.append(JobResult(job.name, cancelled=True))
+                continue
+            if self.prepare is not None:
+                self.prepare(phase, phase_jobs)
+            results += self._run_phase(phase_jobs)
+        return results
+
+    def _stop(self, futures):
+        self.stopped = True
+        for future in futures:
+            future.cancel()
+        processes.terminate()
+
+    def _run_phase(self, jobs: list[Job]) -> list[JobResult]:
+        with ThreadPoolExecutor(max_workers=self.max_jobs) as executor:
+            futures = {executor.submit(job.func): job for job in jobs}
+            for job in jobs:
+                self.log(f"Scheduled: {job.name}")
+            try:
+                results = self._collect(futures)
+            except KeyboardInterrupt:
+                # Running jobs have to be stopped before the executor waits for them
+                self.log("Interrupted, terminating running jobs")
+                self._stop(futures)
+                raise
+        return results
+
+    def _collect(self, futures: dict) -> list[JobResult]:
+        results = []
+        for future in as_completed(futures):
+            job = futures[future]
+            if future.cancelled():
+                result = JobResult(job.name, cancelled=True)
+            else:
+                error = future.exception()
+                # Jobs failing after the stop have most likely been terminated
+                result = JobResult(job.name, error, self.stopped and error is not None)
+
+            if result.cancelled:
+                self.log(f"Cancelled: {job.name}")
+            else:
+                self.log(f"{'Passed' if result.passed else 'Failed'}: {job.name}")
+            results.append(result)
+
+            if not result.passed and not result.cancelled:
+                self.failures += 1
+                limit_reached = self.max_failures and self.failures >= self.max_failures
+                if limit_reached and not self.stopped:
+                    self.log(f"{self.failures} jobs failed, stopping")
+                    self._stop(futures)
+        return results
+
+
+def run_logged(
+    args: list[str], log: IO, env: dict | None = None, registry: ProcessRegistry | None = None
+) -> None:
+    """
+    Run external command with its output redirected to `log`. The command is tracked
+    by `registry`, the one terminated by `JobScheduler` by default.
+    Raises `subprocess.CalledProcessError` when the command fails and `JobCancelled`
+    when the command can't be started because running jobs are being cancelled.
+    """
+    registry = processes if registry is None else registry
+    log.write(f"{args}\n")
+    log.flush()
+    process = registry.popen(args, stdout=log, stderr=log, env=env)
+    try:
+        returncode = process.wait()
+    finally:
+        registry.release(process)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args)
 
 
 def create_test_id(session_name: str, args: list[str]):
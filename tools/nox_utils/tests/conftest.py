@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import pytest
+
+
+def _write_results(path, testcases, seed=1234):
+    """Write cocotb results.xml with (name, time, sim_time, failure) test cases."""
+    cases = []
+    for name, time, sim_time, failure in testcases:
+        inner = f'<failure message="{failure}" />' if failure else ""
+        cases.append(
+            f'<testcase name="{name}" classname="test_mod" file="test_mod.py" lineno="1"'
+            f' time="{time}" sim_time_ns="{sim_time}">{inner}</testcase>'
+        )
+    path.write_text(
+        '<testsuites name="results"><testsuite name="all" package="all">'
+        f'<property name="random_seed" value="{seed}" />{"".join(cases)}'
+        "</testsuite></testsuites>"
+    )
+    # Results are cached by the file stamp, make sure rewrites are noticed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    return str(path)
+
+
+@pytest.fixture
+def write_results():
+    return _write_results
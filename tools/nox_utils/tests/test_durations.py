@@ -0,0 +1,25 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from nox_utils import DurationDB
+
+
+def test_duration_db_detects_regressions(tmp_path, write_results):
+    db = DurationDB(str(tmp_path / "durations.json"), threshold=1.5, min_time=1.0)
+    results = tmp_path / "results.xml"
+
+    write_results(results, [("fast", 2.0, 100.0, None), ("slow", 2.0, 100.0, None)])
+    assert db.record("test", str(results)) == []
+    assert db.durations() == {"test": 4.0}
+
+    # 3.5 s is within 2.0 * 1.5 + 1.0, 4.5 s isn't
+    write_results(results, [("fast", 3.5, 100.0, None), ("slow", 4.5, 200.0, None)])
+    regressions = db.record("test", str(results))
+    assert len(regressions) == 1
+    assert regressions[0].startswith("test::slow: wall time 2.00s -> 4.50s")
+    assert db.durations() == {"test": 8.0}
+
+
+def test_duration_db_ignores_missing_results(tmp_path):
+    db = DurationDB(str(tmp_path / "durations.json"))
+    assert db.record("test", str(tmp_path / "missing.xml")) == []
+    assert db.durations() == {}
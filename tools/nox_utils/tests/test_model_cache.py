@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import pytest
+from nox_utils import ModelCache
+
+# Stand-in for the print-build-inputs target of common.mk
+MAKEFILE = """print-build-inputs:
+\t$(info BUILD_INPUT SIM=$(SIM))
+\t$(info BUILD_INPUT VERILOG_SOURCES=top.sv)
+\t$(info BUILD_INPUT COMPILE_ARGS=+incdir+include -f files.f)
+\t@:
+"""
+
+
+def make_test_dir(path, top="module top; endmodule\n"):
+    (path / "include").mkdir(parents=True)
+    (path / "Makefile").write_text(MAKEFILE)
+    (path / "top.sv").write_text(top)
+    (path / "include" / "defs.svh").write_text("`define WIDTH 8\n")
+    (path / "other.sv").write_text("module other; endmodule\n")
+    (path / "files.f").write_text("other.sv // listed source\n")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ModelCache(str(tmp_path / "cache"))
+
+
+def test_key_depends_on_contents_not_location(tmp_path, cache):
+    a = make_test_dir(tmp_path / "a")
+    b = make_test_dir(tmp_path / "b")
+    assert cache.key(a, ["SIM=verilator"]) == cache.key(b, ["SIM=verilator"])
+    assert cache.key(a, ["SIM=verilator"]) != cache.key(a, ["SIM=vcs"])
+
+
+@pytest.mark.parametrize("source", ["top.sv", "include/defs.svh", "other.sv"])
+def test_key_changes_with_sources(tmp_path, cache, source):
+    test_dir = make_test_dir(tmp_path / "test")
+    key = cache.key(test_dir, [])
+    path = os.path.join(test_dir, source)
+    with open(path, "a") as f:
+        f.write("// changed\n")
+    assert cache.key(test_dir, []) != key
+
+
+def test_key_rehashes_rewritten_file_of_same_size(tmp_path, cache):
+    test_dir = make_test_dir(tmp_path / "test", top="module top; endmodule\n")
+    key = cache.key(test_dir, [])
+    top = tmp_path / "test" / "top.sv"
+    stat = top.stat()
+    top.write_text("module pot; endmodule\n")
+    # Digests are cached by the file stamp, which has to change along with the contents
+    os.utime(top, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.key(test_dir, []) != key
+
+
+def test_built_stamp(tmp_path, cache):
+    key = cache.key(make_test_dir(tmp_path / "test"), [])
+    assert not cache.is_built(key)
+    with cache.lock(key):
+        os.makedirs(cache.model_dir(key))
+        cache.mark_built(key)
+    assert cache.is_built(key)
@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from xml.etree import ElementTree
+
+from nox_utils import ResultsReport, parse_results
+
+
+def test_parse_results(tmp_path, write_results):
+    xml = write_results(
+        tmp_path / "results.xml", [("test_a", 2.0, 100.0, None), ("test_b", 1.0, 50.0, "boom")]
+    )
+    a, b = parse_results(xml)
+    assert (a.name, a.time, a.sim_time, a.failure, a.ratio) == ("test_a", 2.0, 100.0, None, 50.0)
+    assert (b.name, b.failure) == ("test_b", "boom")
+
+
+def test_parse_results_notices_rewrites(tmp_path, write_results):
+    path = tmp_path / "results.xml"
+    write_results(path, [("test_a", 1.0, 1.0, "boom")])
+    assert parse_results(str(path))[0].failure == "boom"
+    write_results(path, [("test_a", 1.0, 1.0, None)])
+    assert parse_results(str(path))[0].failure is None
+
+
+def test_results_report_merges_tests(tmp_path, write_results):
+    report = ResultsReport(str(tmp_path / "merged.xml"))
+    report.add("first", write_results(tmp_path / "first.xml", [("test_a", 1.0, 10.0, None)]))
+    report.add("second", write_results(tmp_path / "second.xml", [("test_b", 2.0, 20.0, "boom")]))
+    # Rerun of a test replaces its previous results
+    report.add("first", write_results(tmp_path / "first.xml", [("test_a", 3.0, 10.0, "late")]))
+
+    root = ElementTree.parse(report.path).getroot()
+    suites = {suite.get("name"): suite for suite in root.iter("testsuite")}
+    assert sorted(suites) == ["first", "second"]
+    assert (root.get("tests"), root.get("failures"), root.get("time")) == ("2", "2", "5.0")
+    assert suites["first"].find("testcase/failure").get("message") == "late"
+
+
+def test_results_report_shared_between_writers(tmp_path, write_results):
+    path = str(tmp_path / "merged.xml")
+    ResultsReport(path).add("first", write_results(tmp_path / "a.xml", [("a", 1.0, 1.0, None)]))
+    ResultsReport(path).add("second", write_results(tmp_path / "b.xml", [("b", 1.0, 1.0, None)]))
+    names = [suite.get("name") for suite in ElementTree.parse(path).getroot().iter("testsuite")]
+    assert names == ["first", "second"]
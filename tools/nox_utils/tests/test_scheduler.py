@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import stat
+import time
+
+import pytest
+from nox_utils import CoverageMerge, Job, JobScheduler, run_logged
+
+# Stand-in for verilator_coverage: concatenates the inputs into the output, slowly enough
+# for the merge to still be running when the scheduler stops
+FAKE_VERILATOR_COVERAGE = """#!/bin/sh
+touch "$MERGE_STARTED"
+sleep 1
+out="$2"
+shift 2
+cat "$@" > "$out"
+"""
+
+
+@pytest.fixture
+def fake_coverage_tool(tmp_path, monkeypatch):
+    tool = tmp_path / "bin" / "verilator_coverage"
+    tool.parent.mkdir()
+    tool.write_text(FAKE_VERILATOR_COVERAGE)
+    tool.chmod(tool.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tool.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("MERGE_STARTED", str(tmp_path / "merge_started"))
+    return tmp_path / "merge_started"
+
+
+def test_fail_fast_keeps_coverage_merges(tmp_path, fake_coverage_tool):
+    names = ["a_pass", "b_pass", "c_fail", "d_slow"]
+    merge = CoverageMerge(names, str(tmp_path / "cache"), "verilator", 2, log=lambda _: None)
+
+    def passing(name):
+        db = tmp_path / f"{name}.dat"
+        db.write_text(f"{name}\n")
+        merge.add(name, str(db))
+
+    def failing():
+        merge.add("c_fail", None)
+        # Fail while the merge of the passing tests is running
+        while not fake_coverage_tool.exists():
+            time.sleep(0.01)
+        raise Exception("SimFailure")
+
+    def slow():
+        try:
+            with open(tmp_path / "slow.log", "w") as log:
+                run_logged(["sleep", "30"], log)
+        except BaseException:
+            merge.add("d_slow", None)
+            raise
+
+    jobs = [
+        Job("a_pass", lambda: passing("a_pass")),
+        Job("b_pass", lambda: passing("b_pass")),
+        Job("c_fail", failing),
+        Job("d_slow", slow),
+    ]
+    scheduler = JobScheduler(4, log=lambda _: None, max_failures=1)
+    start = time.monotonic()
+    results = {r.name: r for r in scheduler.run(jobs)}
+
+    assert scheduler.stopped
+    assert time.monotonic() - start < 30
+    assert results["a_pass"].passed and results["b_pass"].passed
+    assert not results["c_fail"].passed and not results["c_fail"].cancelled
+    assert results["d_slow"].cancelled
+
+    database = merge.finish()
+    assert not merge.errors
+    with open(database) as f:
+        assert f.read() == "a_pass\nb_pass\n"
+
+
+def test_failed_merge_keeps_partial_coverage(tmp_path, fake_coverage_tool):
+    (fake_coverage_tool.parent / "bin" / "verilator_coverage").write_text("#!/bin/sh\nexit 1\n")
+    messages = []
+    merge = CoverageMerge(["a", "b"], str(tmp_path / "cache"), "verilator", 1, messages.append)
+    for name in ["a", "b"]:
+        db = tmp_path / f"{name}.dat"
+        db.write_text(f"{name}\n")
+        merge.add(name, str(db))
+
+    database = merge.finish()
+    assert len(merge.errors) == 1
+    assert database == str(tmp_path / "a.dat")
+    assert any("failed" in message for message in messages)
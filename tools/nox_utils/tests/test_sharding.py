@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from nox_utils import Job, parse_shard, shard_jobs
+
+
+def make_jobs(names):
+    return [Job(name, lambda: None) for name in names]
+
+
+@pytest.mark.parametrize("shard, expected", [("1/1", (1, 1)), ("2/3", (2, 3))])
+def test_parse_shard(shard, expected):
+    assert parse_shard(shard) == expected
+
+
+@pytest.mark.parametrize("shard", ["0/2", "3/2", "1", "a/b", "1/2/3"])
+def test_parse_invalid_shard(shard):
+    with pytest.raises(ValueError):
+        parse_shard(shard)
+
+
+def test_shards_cover_all_jobs_once():
+    jobs = make_jobs([f"test_{i}" for i in range(10)])
+    durations = {f"test_{i}": float(i) for i in range(0, 10, 2)}
+    parts = [shard_jobs(jobs, durations, shard, 3) for shard in range(1, 4)]
+    names = [job.name for part in parts for job in part]
+    assert sorted(names) == sorted(job.name for job in jobs)
+    # Jobs keep their original order within a shard
+    for part in parts:
+        assert part == [job for job in jobs if job in part]
+
+
+def test_shards_are_balanced():
+    durations = {"long": 10.0, "mid_a": 6.0, "mid_b": 4.0, "short_a": 3.0, "short_b": 3.0}
+    jobs = make_jobs(durations)
+    totals = [
+        sum(durations[job.name] for job in shard_jobs(jobs, durations, shard, 2))
+        for shard in (1, 2)
+    ]
+    assert sorted(totals) == [13.0, 13.0]
+
+
+def test_unknown_durations_default_to_average():
+    jobs = make_jobs(["known_a", "known_b", "new_a", "new_b"])
+    durations = {"known_a": 1.0, "known_b": 3.0}
+    parts = [{job.name for job in shard_jobs(jobs, durations, shard, 2)} for shard in (1, 2)]
+    # Unknown jobs take 2.0 each: known_b + known_a on one shard, the new ones on the other
+    assert {"known_a", "known_b"} in parts
+    assert {"new_a", "new_b"} in parts
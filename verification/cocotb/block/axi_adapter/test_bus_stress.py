@@ -4,7 +4,7 @@ import logging
 import random
 
 from bus2csr import dword2int, get_frontend_bus_if, int2bytes, int2dword
-from cocotb_helpers import reset_n
+from cocotb_helpers import reset_n, wait_for
 from cocotbext.axi.constants import AxiBurstType
 
 import cocotb
@@ -89,8 +89,7 @@ async def test_collision_with_write(dut):
     async def reader(return_data):
         # Wait until there is data in FIFO
         read_offset = 2
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
 
         # Read sequence should read data on each write data
         for i in range(data_len):
@@ -133,8 +132,7 @@ async def test_collision_with_read(dut):
 
     async def reader(return_data):
         # Wait until there is data in FIFO
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
 
         # Read sequence should just read data
         for _ in range(data_len):
@@ -0,0 +1 @@
+../lib_adapter/test_csr_bench.py
\ No newline at end of file
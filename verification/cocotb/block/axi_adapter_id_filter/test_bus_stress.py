@@ -3,6 +3,7 @@ import random
 
 from axi_utils import initialize_dut
 from bus2csr import dword2int, int2bytes, int2dword
+from cocotb_helpers import wait_for
 from cocotbext.axi.constants import AxiBurstType
 from utils import Access, draw_axi_priv_ids, get_axi_ids_seq, target_test
 
@@ -54,8 +55,7 @@ async def collision_with_write(dut, filter_off=False, awid_priv=Access.Priv, ari
     async def reader(return_data):
         # Wait until there is data in FIFO
         read_offset = 2
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
 
         # Read sequence should read data on each write data
         for i in range(data_len):
@@ -120,8 +120,7 @@ async def collision_with_read(dut, filter_off=False, awid_priv=True, arid_priv=T
 
     async def reader(return_data):
         # Wait until there is data in FIFO
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
 
         # Read sequence should just read data
         for i in range(data_len):
@@ -329,8 +328,7 @@ async def test_collision_with_write_mixed_priv(dut):
         # Ensure appropriate response based on ID
         # Wait until there is data in FIFO
         read_offset = 2
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
         # Read sequence should read data on each write data
         for i in range(data_len):
             # Awaiting `awvalid` causes reading simultaneously with write data channel activity
@@ -371,8 +369,7 @@ async def test_collision_with_read_mixed_priv(dut):
 
     async def reader():
         # Wait until there is data in FIFO
-        while int(dut.fifo_depth_o.value) < read_offset:
-            await RisingEdge(tb.clk)
+        await wait_for(dut.fifo_depth_o, lambda value: int(value) >= read_offset, clk=tb.clk)
 
         # Read sequence should just read data
         for i in range(data_len):
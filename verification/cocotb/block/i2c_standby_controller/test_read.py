@@ -7,7 +7,7 @@ from typing import Any
 import i2c
 from cocotbext.i2c import I2cMaster
 from hci import TxFifo
-from utils import Sequence, SequenceFailed, split_into_dwords
+from utils import Sequence, SequenceFailed, gated_on, split_into_dwords
 
 import cocotb
 from cocotb.clock import Clock
@@ -90,6 +90,7 @@ def CheckNoStretch(dut: Any) -> bool:
     return True
 
 
+@gated_on(lambda dut: i2c.MatchOTAcqDataExact.gated_on(standby_ctrl(dut)))
 def MatchOTAcqDataExact(value, dut, mask=0x3FF):
     return i2c.MatchOTAcqDataExact(value, standby_ctrl(dut), mask)
 
@@ -8,7 +8,7 @@ import colorama
 import i2c
 from cocotbext.i2c import I2cMaster
 from hci import TxFifo
-from utils import Sequence, SequenceFailed, split_into_dwords
+from utils import Sequence, SequenceFailed, gated_on, split_into_dwords
 
 import cocotb
 from cocotb.clock import Clock
@@ -40,14 +40,17 @@ def CheckNoStretch(dut: Any) -> bool:
     return True
 
 
+@gated_on(lambda dut: i2c.MatchOTAcqDataExact.gated_on(standby_ctrl(dut)))
 def MatchOTAcqDataExact(value, dut, mask=0x3FF) -> bool:
     return i2c.MatchOTAcqDataExact(value, standby_ctrl(dut), mask)
 
 
+@gated_on(i2c.MatchTTIResponseExact.gated_on)
 def MatchTTIResponseExact(byte_count: int, dut: Any) -> bool:
     return i2c.MatchTTIResponseExact(byte_count, dut)
 
 
+@gated_on(i2c.MatchTTIDataExact.gated_on)
 def MatchTTIDataExact(value, dut, mask=0xFFFF_FFFF) -> bool:
     return i2c.MatchTTIDataExact(value, dut, mask)
 
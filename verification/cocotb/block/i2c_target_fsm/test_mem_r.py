@@ -6,7 +6,7 @@ from typing import Any
 from cocotbext.i2c import I2cMaster
 from hci import TxFifo
 from i2c import reset_controller
-from utils import Sequence, SequenceFailed
+from utils import Sequence, SequenceFailed, gated_on
 
 import cocotb
 from cocotb.clock import Clock
@@ -43,6 +43,7 @@ async def read(master: I2cMaster, addr: int, count: int) -> bytearray:
     return data
 
 
+@gated_on(lambda dut: [dut.acq_fifo_wvalid_o])
 def MatchWAcqDataExact(value, dut, mask=0x3FF):
     if dut.acq_fifo_wvalid_o.value:
         if dut.acq_fifo_wdata_o.value & mask == value & mask:
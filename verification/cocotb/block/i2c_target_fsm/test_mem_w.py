@@ -4,7 +4,7 @@ from functools import partial
 
 from cocotbext.i2c import I2cMaster
 from i2c import reset_controller
-from utils import Sequence, SequenceFailed
+from utils import Sequence, SequenceFailed, gated_on
 
 import cocotb
 from cocotb.clock import Clock
@@ -39,6 +39,7 @@ async def write(master: I2cMaster, addr: int, word: bytes):
     await master.send_stop()
 
 
+@gated_on(lambda dut: [dut.acq_fifo_wvalid_o])
 def MatchWDataExact(value, dut):
     if dut.acq_fifo_wvalid_o.value:
         if dut.acq_fifo_wdata_o.value == value:
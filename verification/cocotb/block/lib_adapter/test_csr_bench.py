@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from bus2csr import get_frontend_bus_if
+from csr_bench import run_csr_bench
+
+import cocotb
+from cocotb.handle import SimHandleBase
+
+
+@cocotb.test()
+async def test_csr_bench(dut: SimHandleBase):
+    """Measure cost of CSR accesses through the bus adapter."""
+    if hasattr(dut, "disable_id_filtering_i"):
+        dut.disable_id_filtering_i.value = 1
+    tb = get_frontend_bus_if()(dut)
+    await tb.register_test_interfaces()
+
+    regs = tb.reg_map.I3C_EC.SOCMGMTIF
+    scratch = [regs.SOC_MGMT_RSVD_2.base_addr, regs.SOC_MGMT_RSVD_3.base_addr]
+    # Only the AXI adapter wrapper loops TTI TX data back through a FIFO
+    fifo = {}
+    if hasattr(dut, "fifo_depth_o"):
+        fifo = {
+            "fifo_write_addr": tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr,
+            "fifo_read_addr": tb.reg_map.I3C_EC.SECFWRECOVERYIF.INDIRECT_FIFO_DATA.base_addr,
+        }
+    await run_csr_bench(tb, scratch, **fifo)
@@ -201,3 +201,45 @@ async def test_sequence_csr_write(dut: SimHandleBase):
             await read_csr_and_verify(tb, addr, value)
         except Exception as e:
             raise Exception(f"{name} register verification failed:\n{e}")
+
+
+@controller_test()
+async def test_sequence_csr_access_many(dut: SimHandleBase):
+    disable_id_filtering(dut)
+    tb = get_frontend_bus_if()(dut)
+    await tb.register_test_interfaces()
+
+    # name: (addr, value)
+    rw_csr_seq = {
+        "CONTROLLER_DEVICE_ADDR": (
+            tb.reg_map.I3CBASE.CONTROLLER_DEVICE_ADDR.base_addr,
+            rand_bits32() & ((mask_bits(1) << 31) | (mask_bits(7) << 16)),
+        ),
+        "QUEUE_THLD_CTRL": (tb.reg_map.PIOCONTROL.QUEUE_THLD_CTRL.base_addr, rand_bits32()),
+        "PIO_INTR_STATUS_ENABLE": (
+            tb.reg_map.PIOCONTROL.PIO_INTR_STATUS_ENABLE.base_addr,
+            rand_bits32() & ((mask_bits(1) << 9) | mask_bits(6)),
+        ),
+        "PIO_INTR_SIGNAL_ENABLE": (
+            tb.reg_map.PIOCONTROL.PIO_INTR_SIGNAL_ENABLE.base_addr,
+            rand_bits32() & ((mask_bits(1) << 9) | mask_bits(6)),
+        ),
+    }
+
+    # Write all the registers with multiple transactions in flight, then read them back.
+    # The registers are independent, so the accesses may be reordered
+    await tb.write_csr_many(
+        [(addr, int2dword(value)) for addr, value in rw_csr_seq.values()], ordered=False
+    )
+    resps = await tb.read_csr_many([addr for addr, _ in rw_csr_seq.values()], ordered=False)
+
+    for (name, (addr, value)), resp in zip(rw_csr_seq.items(), resps):
+        try:
+            compare_values(int2dword(value), resp, addr)
+        except Exception as e:
+            raise Exception(f"{name} register verification failed:\n{e}")
+
+    # Issue non-blocking reads and await their results afterwards
+    reads = [tb.read_csr_nowait(addr) for addr, _ in rw_csr_seq.values()]
+    for (addr, value), read in zip(rw_csr_seq.values(), reads):
+        compare_values(int2dword(value), await read, addr)
@@ -2,6 +2,7 @@
 
 TOPLEVEL_LANG    = verilog
 SIM             ?= verilator
+# Dump waveforms, set to 0 to build the simulation model without tracing
 WAVES           ?= 1
 
 # Paths
@@ -67,7 +68,9 @@ ifeq ($(SIM), verilator)
     COMPILE_ARGS += -Wall -Wno-fatal
     COMPILE_ARGS += --x-assign unique --x-initial unique
 
-    EXTRA_ARGS += --trace --trace-structs
+    ifeq ($(WAVES), 1)
+        EXTRA_ARGS += --trace --trace-structs
+    endif
     EXTRA_ARGS += $(VERILATOR_COVERAGE)
     EXTRA_ARGS += -Wno-DECLFILENAME -Wno-TIMESCALEMOD
 endif
@@ -77,20 +80,26 @@ ifeq ($(SIM), vcs)
     COMPILE_ARGS += +define+DIGITAL_IO_I3C
     COMPILE_ARGS += $(foreach dir,$(VERILOG_INCLUDE_DIRS),-y $(dir))
     COMPILE_ARGS += -debug_access+all +memcbk -assert svaext
-    SIM_ARGS += +dumpon
-    EXTRA_ARGS += +vcs+vcdpluson +vpdfile+dump.vpd +vcs+lic+wait
+    ifeq ($(WAVES), 1)
+        SIM_ARGS += +dumpon
+        EXTRA_ARGS += +vcs+vcdpluson +vpdfile+dump.vpd
+    endif
+    EXTRA_ARGS += +vcs+lic+wait
 
     ifneq ($(COVERAGE_TYPE),)
         EXTRA_ARGS += -cm line+cond+fsm+tgl+branch -lca
 
-        # Generate cm.cfg file based on waivers.yaml.
+        # Generate cm.cfg file based on waivers.yaml, unless it's up to date. Tests run
+        # concurrently by nox have it generated up front, so that they don't overwrite it
+        # while the others are being built.
         ifeq ($(TOPLEVEL),)
             $(error TOPLEVEL undefined!)
         endif
         $(shell mkdir -p $(TEST_DIR)/sim_build)
         CM_FILE := $(TEST_DIR)/sim_build/cm.cfg
         CONVERTER_LOG := $(TEST_DIR)/sim_build/waivers_converter.log
-        $(shell waivers-converter $(I3C_ROOT_DIR)/verification/waivers.yaml -o $(CM_FILE) --top $(TOPLEVEL) >$(CONVERTER_LOG))
+        WAIVERS_FILE := $(I3C_ROOT_DIR)/verification/waivers.yaml
+        $(shell [ $(CM_FILE) -nt $(WAIVERS_FILE) ] || waivers-converter $(WAIVERS_FILE) -o $(CM_FILE) --top $(TOPLEVEL) >$(CONVERTER_LOG))
 
         COMPILE_ARGS += -cm_hier $(CM_FILE)
     endif
@@ -115,13 +124,26 @@ ifneq ($(COVERAGE_TYPE),)
     endif
 endif
 
+# Simulation working directory
+# Simulators write their default outputs (`dump.vcd`, `coverage.dat`) to the current directory.
+# Tests running concurrently in the same test directory have to be given separate directories.
+RUN_DIR ?=
+ifneq ($(RUN_DIR),)
+    $(shell mkdir -p $(RUN_DIR))
+    override SIM_BUILD := $(abspath $(or $(SIM_BUILD),sim_build))
+    override COCOTB_RESULTS_FILE := $(abspath $(or $(COCOTB_RESULTS_FILE),results.xml))
+    SIM_CMD_PREFIX := env -C $(abspath $(RUN_DIR)) $(SIM_CMD_PREFIX)
+    # Test modules are no longer found in the current directory
+    export PYTHONPATH := $(PYTHONPATH):$(TEST_DIR)
+endif
+
 include $(shell cocotb-config --makefiles)/Makefile.sim
 
 ifeq ($(SIM), vcs)
 
 .PHONY: convert-vpd2vcd
 convert-vpd2vcd: $(COCOTB_RESULTS_FILE)
-	if [ -e "dump.vpd" ] ; then \
+	cd $(abspath $(or $(RUN_DIR),.)) && if [ -e "dump.vpd" ] ; then \
 		vpd2vcd -full64 dump.vpd dump.vcd +splitpacked;\
 	fi
 
@@ -129,8 +151,44 @@ all: sim convert-vpd2vcd
 
 endif
 
+# Simulation model
+ifeq ($(SIM), vcs)
+    SIM_MODEL := $(SIM_BUILD)/simv
+    SIM_GOALS := $(COCOTB_RESULTS_FILE) convert-vpd2vcd
+else
+    SIM_MODEL := $(SIM_BUILD)/Vtop
+    SIM_GOALS := $(COCOTB_RESULTS_FILE)
+endif
+
+.PHONY: build run print-build-inputs
+build: $(SIM_MODEL)
+
+# Run the simulation with a model built beforehand (e.g. taken from a model cache),
+# the model is not rebuilt even if it is older than its sources
+run:
+	$(RM) $(COCOTB_RESULTS_FILE)
+	$(MAKE) -f $(firstword $(MAKEFILE_LIST)) -o $(SIM_MODEL) $(SIM_GOALS)
+
+# Version of the simulator, queried directly as not every flow of cocotb makefiles defines it
+SIM_VERSION = $(shell $(if $(filter vcs,$(SIM)),vcs -ID 2>&1 | grep -i version,verilator --version))
+
+# Everything the simulation model depends on, used to key the model cache
+print-build-inputs:
+	$(info BUILD_INPUT SIM=$(SIM))
+	$(info BUILD_INPUT SIM_VERSION=$(SIM_VERSION))
+	$(info BUILD_INPUT COCOTB_VERSION=$(shell cocotb-config --version))
+	$(info BUILD_INPUT CFG_NAME=$(CFG_NAME))
+	$(info BUILD_INPUT TOPLEVEL=$(TOPLEVEL))
+	$(info BUILD_INPUT VERILOG_SOURCES=$(VERILOG_SOURCES))
+	$(info BUILD_INPUT COMPILE_ARGS=$(COMPILE_ARGS))
+	$(info BUILD_INPUT EXTRA_ARGS=$(EXTRA_ARGS))
+	$(info BUILD_INPUT BUILD_PLUSARGS=$(if $(filter vcs,$(SIM)),$(PLUSARGS)))
+	@:
+
 CFG_FILE ?= $(I3C_ROOT)/i3c_core_configs.yaml## Path: YAML file holding configuration of the I3C RTL
 CFG_NAME ?= axi## Valid configuration name from the YAML configuration file
+# Tests report results per configuration
+export CFG_NAME
 
 $(TEST_DIR)/sim_build/i3c_config.vh:
 	pushd $(I3C_ROOT) && CFG_FILE=$(CFG_FILE) CFG_NAME=$(CFG_NAME) make config && popd
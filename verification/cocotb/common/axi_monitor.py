@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from cocotbext.axi import AxiResp
+
+import cocotb
+from cocotb.handle import SimHandleBase
+from cocotb.triggers import Edge, First, ReadOnly, RisingEdge
+from cocotb.utils import get_sim_time
+
+_T = TypeVar("_T")
+
+
+async def handshake(clk, valid, ready, sample: Callable[[], _T]) -> _T:
+    """
+    Wait for a handshake of 'valid' and 'ready' & return the result of 'sample', called
+    while the handshake is pending to read its payload. Returns at the rising edge of 'clk'
+    which completes the handshake. Signals are read in the read-only phase of each time
+    step, where they hold the settled values which the DUT samples at the next edge, before
+    or after the edge alike on every simulator. Wakes up on every clock edge only while both
+    are asserted, otherwise only when either changes.
+    """
+    await ReadOnly()
+    while not (valid.value and ready.value):
+        await First(Edge(valid), Edge(ready))
+        await ReadOnly()
+    result = sample()
+    await RisingEdge(clk)
+    return result
+
+
+@dataclass
+class AxiTransaction:
+    """AXI transaction observed on the bus, times of its handshake edges are in ns."""
+
+    write: bool
+    addr: int
+    id: int
+    user: int
+    start: float
+    end: Optional[float] = None
+    resp: Optional[AxiResp] = None
+    # Read data beats
+    data: List[int] = field(default_factory=list)
+    # Returned by 'sample' of the monitor at the request
+    info: Any = None
+
+    @property
+    def latency(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+
+class AxiTransactionMonitor:
+    """
+    Records AXI transactions on signals of 'dut' named after the AXI channels (arvalid, rid,
+    ...). Requests are matched with responses by the transaction ID. Completed transactions
+    are appended to 'transactions' and passed to callbacks. The optional 'sample' is called
+    at each request, its result is stored in the transaction 'info'.
+    """
+
+    def __init__(self, dut: SimHandleBase, clk, sample: Callable[[], Any] = None) -> None:
+        self.dut = dut
+        self.clk = clk
+        self.sample = sample
+        self.transactions: List[AxiTransaction] = []
+        self.callbacks: List[Callable[[AxiTransaction], None]] = []
+        self._tasks = []
+
+    def add_callback(self, callback: Callable[[AxiTransaction], None]) -> None:
+        self.callbacks.append(callback)
+
+    def start(self) -> "AxiTransactionMonitor":
+        """Monitor reads and writes in the background."""
+        self._tasks.append(cocotb.start_soon(self.monitor_reads()))
+        self._tasks.append(cocotb.start_soon(self.monitor_writes()))
+        return self
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.kill()
+        self._tasks = []
+
+    def _request(self, addr, tid, user) -> Tuple[int, int, int, Any]:
+        """Address, ID, user & sampled info of a request."""
+        info = self.sample() if self.sample else None
+        return int(addr.value), int(tid.value), int(user.value), info
+
+    def _complete(self, transaction: AxiTransaction, resp: int) -> None:
+        transaction.end = get_sim_time("ns")
+        transaction.resp = AxiResp(resp)
+        self.transactions.append(transaction)
+        for callback in self.callbacks:
+            callback(transaction)
+
+    async def _monitor_requests(self, pending: Dict[int, Deque[AxiTransaction]], write: bool):
+        dut = self.dut
+        ax = "aw" if write else "ar"
+        valid, ready = getattr(dut, f"{ax}valid"), getattr(dut, f"{ax}ready")
+        addr, tid, user = [getattr(dut, f"{ax}{name}") for name in ["addr", "id", "user"]]
+        while True:
+            *fields, info = await handshake(
+                self.clk, valid, ready, lambda: self._request(addr, tid, user)
+            )
+            transaction = AxiTransaction(write, *fields, get_sim_time("ns"), info=info)
+            pending[transaction.id].append(transaction)
+
+    async def monitor_reads(self) -> None:
+        """Record read transactions, completed by the last beat of data."""
+        dut = self.dut
+        pending = defaultdict(deque)
+        self._tasks.append(cocotb.start_soon(self._monitor_requests(pending, write=False)))
+
+        def beat() -> Tuple[int, int, bool, int]:
+            return (
+                int(dut.rid.value),
+                int(dut.rdata.value),
+                bool(dut.rlast.value),
+                int(dut.rresp.value),
+            )
+
+        while True:
+            rid, rdata, rlast, rresp = await handshake(self.clk, dut.rvalid, dut.rready, beat)
+            assert pending[rid], f"Read response with ID {rid:#x} without a request"
+            transaction = pending[rid][0]
+            transaction.data.append(rdata)
+            if rlast:
+                self._complete(pending[rid].popleft(), rresp)
+
+    async def monitor_writes(self) -> None:
+        """Record write transactions, completed by the write response."""
+        dut = self.dut
+        pending = defaultdict(deque)
+        self._tasks.append(cocotb.start_soon(self._monitor_requests(pending, write=True)))
+        while True:
+            bid, bresp = await handshake(
+                self.clk, dut.bvalid, dut.bready, lambda: (int(dut.bid.value), int(dut.bresp.value))
+            )
+            assert pending[bid], f"Write response with ID {bid:#x} without a request"
+            self._complete(pending[bid].popleft(), bresp)
@@ -1,27 +1,47 @@
 # SPDX-License-Identifier: Apache-2.0
 
+from contextlib import contextmanager
 from enum import IntEnum
 from functools import reduce
 from importlib import import_module
 from math import log2
 from random import choice, randint
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+from axi_monitor import AxiTransaction, AxiTransactionMonitor
 
 # AHB
+from cocotb_AHB.AHB_common.AHB_types import IRESP, MCMD, MDATA
 from cocotb_AHB.AHB_common.InterconnectInterface import InterconnectWrapper
 from cocotb_AHB.drivers.DutSubordinate import DUTSubordinate
 from cocotb_AHB.drivers.SimSimpleManager import SimSimpleManager
 from cocotb_AHB.interconnect.SimInterconnect import SimInterconnect
 
 # AXI
-from cocotbext.axi import AxiBus, AxiMaster, AxiResp
+from cocotbext.axi import AxiBurstType, AxiBus, AxiMaster, AxiResp
+from cocotbext.axi.axi_master import AxiReadResp, AxiWriteResp
+from packing import (  # noqa: F401
+    bytes2int,
+    dword2int,
+    int2bytes,
+    int2dword,
+    pad_to_dwords,
+)
 from reg_map import reg_map
 
 # Cocotb
 import cocotb
 from cocotb.clock import Clock
 from cocotb.handle import SimHandleBase
-from cocotb.triggers import ClockCycles, RisingEdge, with_timeout
+from cocotb.task import Task
+from cocotb.triggers import (
+    ClockCycles,
+    Combine,
+    FallingEdge,
+    Lock,
+    RisingEdge,
+    with_timeout,
+)
 
 
 # Helpers
@@ -37,23 +57,18 @@ async def setup_dut(clk, rst_n, clk_period: Tuple[int, str]) -> None:
     await ClockCycles(clk, 1)
 
 
-def int2bytes(value: int, byte_width=4) -> List[int]:
-    assert value == 0 or (
-        log2(value) <= byte_width * 8
-    ), f"Requested int: {value:#x} exceeds {byte_width:#x} bytes."
-    return [(value >> (b * 8)) & 0xFF for b in range(byte_width)]
-
-
-def bytes2int(data: List[int], byte_width=4) -> int:
-    return reduce(lambda acc, bi: acc + (bi[0] << (bi[1] * 8)), zip(data, range(byte_width)), 0)
-
-
-def int2dword(value: int) -> List[int]:
-    return int2bytes(value, 4)
-
-
-def dword2int(data: List[int]) -> int:
-    return bytes2int(data, 4)
+def csr_fields(regs=reg_map) -> Dict[int, list]:
+    """Collect fields of each register in 'regs' keyed by the register address."""
+    fields = {}
+    for node in regs.values():
+        if not isinstance(node, dict):
+            continue
+        reg_fields = [f for f in node.values() if isinstance(f, dict) and "mask" in f]
+        if reg_fields and "base_addr" in node:
+            fields[node.base_addr] = reg_fields
+        else:
+            fields.update(csr_fields(node))
+    return fields
 
 
 def compare_values(expected: List[int], actual: List[int], addr: int):
@@ -73,6 +88,11 @@ class FrontBusTestInterface:
         self.clk = clk
         self.rst_n = rst_n
         self.reg_map = reg_map
+        # Shadow copy of CSR values written by the testbench, see csr_cache()
+        self._csr_cache = None
+        self._csr_cache_trust_hw = False
+        self._csr_cache_reset_task = None
+        self._csr_fields = csr_fields(self.reg_map)
 
     async def register_test_interfaces(self, fclk=500.0):
         tclk = int(1e6 / fclk + 0.5)
@@ -96,12 +116,198 @@ class FrontBusTestInterface:
         """Send a write request & await transfer to finish."""
         raise NotImplementedError
 
+    def read_csr_nowait(
+        self, addr: int, size: int = 4, arid=None, timeout: int = 1, units: str = "us"
+    ) -> Task:
+        """Send a read request without awaiting the response.
+        Returns a task which, once awaited, yields the read data."""
+        return cocotb.start_soon(self.read_csr(addr, size, arid, timeout, units))
+
+    def write_csr_nowait(
+        self,
+        addr: int,
+        data: List[int],
+        size: int = 4,
+        awid=None,
+        timeout: int = 1,
+        units: str = "us",
+    ) -> Task:
+        """Send a write request without awaiting the transfer to finish.
+        Returns a task which can be awaited for the transfer to finish."""
+        return cocotb.start_soon(self.write_csr(addr, data, size, awid, timeout, units))
+
+    async def read_csr_many(
+        self,
+        addrs: List[int],
+        size: int = 4,
+        arid=None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+    ) -> List[List[int]]:
+        """Read CSRs at 'addrs' & await all the responses, 'timeout' applies to each read.
+        Reads are issued one by one, interfaces of pipelined buses issue them back to back."""
+        return [await self.read_csr(addr, size, arid, timeout, units) for addr in addrs]
+
+    async def write_csr_many(
+        self,
+        writes: List[Tuple[int, List[int]]],
+        size: int = 4,
+        awid=None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+    ) -> None:
+        """Write (address, data) pairs & await all the transfers, 'timeout' applies to each write.
+        Writes are issued one by one, interfaces of pipelined buses issue them back to back."""
+        for addr, data in writes:
+            await self.write_csr(addr, data, size, awid, timeout, units)
+
+    async def write_fifo(
+        self, addr: int, data: List[int], awid=None, timeout: int = 1, units: str = "us"
+    ) -> None:
+        """Write 'data' bytes to the FIFO data port at 'addr' & await all the transfers.
+        Data is padded with zeros to whole dwords, 'timeout' applies to each dword."""
+        data = list(pad_to_dwords(data))
+        writes = [(addr, data[i : i + 4]) for i in range(0, len(data), 4)]
+        await self.write_csr_many(writes, 4, awid, timeout, units)
+
+    async def read_fifo(
+        self, addr: int, count: int, arid=None, timeout: int = 1, units: str = "us"
+    ) -> List[int]:
+        """Read 'count' dwords from the FIFO data port at 'addr'.
+        Returns the read bytes, 'timeout' applies to each dword."""
+        resps = await self.read_csr_many([addr] * count, 4, arid, timeout, units)
+        return [b for resp in resps for b in resp]
+
+    @contextmanager
+    def csr_cache(self, trust_hw_writable: bool = False):
+        """
+        Cache values of CSRs written with write_csr_field() within the context, so that
+        subsequent field writes to the same register skip the read of read-modify-write.
+
+        A register is cached only if all of its fields hold what software last wrote:
+        fields cleared on read, write-one-to-clear or cleared by hardware never are. Fields
+        writable by hardware are trusted only with 'trust_hw_writable', which is for phases
+        when the hardware is known to be idle, e.g. before the target is enabled. The cache
+        is invalidated on reset and on plain CSR writes to the register.
+        """
+        prev = (self._csr_cache, self._csr_cache_trust_hw)
+        if self._csr_cache is None:
+            self._csr_cache = {}
+            self._csr_cache_reset_task = cocotb.start_soon(self._invalidate_csr_cache_on_reset())
+        self._csr_cache_trust_hw = trust_hw_writable
+        try:
+            yield
+        finally:
+            self._csr_cache, self._csr_cache_trust_hw = prev
+            if self._csr_cache is None:
+                self._csr_cache_reset_task.kill()
+                self._csr_cache_reset_task = None
+
+    def invalidate_csr_cache(self, addr: int = None) -> None:
+        """Drop cached value of CSR at 'addr' or of all CSRs, if 'addr' is not given."""
+        if self._csr_cache is None:
+            return
+        if addr is None:
+            self._csr_cache.clear()
+        else:
+            self._csr_cache.pop(addr, None)
+
+    async def _invalidate_csr_cache_on_reset(self):
+        while True:
+            await FallingEdge(self.rst_n)
+            self.invalidate_csr_cache()
+
+    def _csr_cacheable(self, addr: int) -> bool:
+        """Check if all fields of CSR at 'addr' hold what software last wrote to them."""
+        fields = self._csr_fields.get(addr)
+        if not fields:
+            return False
+        for field in fields:
+            if field.hwclr or field.rclr or field.woclr:
+                return False
+            if "w" in field.hw and not self._csr_cache_trust_hw:
+                return False
+        return True
+
+    def _cached_csr(self, addr: int):
+        """Return cached value of CSR at 'addr', None if it's not cached."""
+        if self._csr_cache is None or not self._csr_cacheable(addr):
+            return None
+        return self._csr_cache.get(addr)
+
+    def _cache_csr(self, addr: int, value: int) -> None:
+        """Record 'value' written to CSR at 'addr' if it can be trusted."""
+        if self._csr_cache is None or not self._csr_cacheable(addr):
+            return
+        # Write-only fields read back as zeros
+        for field in self._csr_fields[addr]:
+            if "r" not in field.sw:
+                value &= ~field.mask
+        self._csr_cache[addr] = value
+
     async def write_csr_field(self, reg_addr, field, data, awid=None) -> None:
-        """Read -> modify -> write CSR"""
-        value = bytes2int(await self.read_csr(reg_addr, arid=awid))
+        """Read -> modify -> write CSR, the read is skipped if CSR value is cached"""
+        value = self._cached_csr(reg_addr)
+        if value is None:
+            value = bytes2int(await self.read_csr(reg_addr, arid=awid))
         value = value & ~field.mask
         value = value | (data << field.low)
         await self.write_csr(reg_addr, int2bytes(value), awid=awid)
+        self._cache_csr(reg_addr, value)
+
+    async def apply_csr_program(self, program, verify: bool = False, awid=None) -> None:
+        """
+        Apply a list of (register address, field, value) updates. Updates of the same register
+        are merged into a single read-modify-write, registers are written in order of their
+        first update. The reads, issued at once, are skipped for registers that are cached or
+        have all their fields updated. With 'verify' all the registers are read back at once
+        & the updated fields are compared with the values written.
+        """
+        updates = {}
+        for reg_addr, field, data in program:
+            updates.setdefault(reg_addr, []).append((field, data))
+        if not updates:
+            return
+
+        values = {}
+        for addr, fields in updates.items():
+            value = self._cached_csr(addr)
+            if value is None and self._csr_fields.get(addr):
+                # All fields are overwritten, there's nothing to preserve
+                updated = reduce(lambda m, f: m | f[0].mask, fields, 0)
+                if all((f.mask & ~updated) == 0 for f in self._csr_fields[addr]):
+                    value = 0
+            values[addr] = value
+        reads = [addr for addr, value in values.items() if value is None]
+        if reads:
+            for addr, data in zip(reads, await self.read_csr_many(reads, arid=awid)):
+                values[addr] = bytes2int(data)
+
+        for addr, fields in updates.items():
+            for field, data in fields:
+                values[addr] = values[addr] & ~field.mask | (data << field.low)
+        await self.write_csr_many(
+            [(addr, int2bytes(value)) for addr, value in values.items()], awid=awid
+        )
+        for addr, value in values.items():
+            self._cache_csr(addr, value)
+
+        if not verify:
+            return
+        reads = await self.read_csr_many(list(updates), arid=awid)
+        for (addr, fields), data in zip(updates.items(), reads):
+            for field, _ in fields:
+                # Write-only fields read back as zeros
+                if "r" not in field.sw:
+                    continue
+                expected = (values[addr] & field.mask) >> field.low
+                actual = (bytes2int(data) & field.mask) >> field.low
+                assert actual == expected, (
+                    f"Field {field.mask:#x} of CSR at {addr:#x} differs. "
+                    f"Expected: {expected:#x} Got: {actual:#x}"
+                )
 
     async def read_csr_field(self, reg_addr, field, arid=None) -> int:
         value = bytes2int(await self.read_csr(reg_addr, arid=arid))
@@ -110,6 +316,54 @@ class FrontBusTestInterface:
         return value
 
 
+class PipelinedManager(SimSimpleManager):
+    """
+    AHB manager model issuing transfers of multiple requests back to back.
+
+    Relies on internals of SimSimpleManager of the cocotb-AHB version pinned in
+    requirements.txt: read() & write() replace 'commands' with the (command, data) pairs of
+    the request, then the manager issues 'commands' from 'cnt' on and appends a response to
+    each to 'responses'. Check them when updating cocotb-AHB.
+    """
+
+    def __init__(self, bus_width: int) -> None:
+        super().__init__(bus_width)
+        # Splits requests into commands, without touching the state of the manager
+        self._builder = SimSimpleManager(bus_width)
+
+    def read_commands(self, addr: int, size: int) -> List[Tuple[MCMD, MDATA]]:
+        """Commands performing a read of 'size' bytes at 'addr'."""
+        self._builder.read(addr, size)
+        return self._builder.commands
+
+    def write_commands(
+        self, addr: int, size: int, data: List[int], strb: List[int]
+    ) -> List[Tuple[MCMD, MDATA]]:
+        """Commands performing a write of 'size' bytes of 'data' at 'addr'."""
+        self._builder.write(addr, size, data, strb)
+        return self._builder.commands
+
+    def issue(self, commands: List[Tuple[MCMD, MDATA]]) -> None:
+        """Issue 'commands' back to back, the way read() & write() issue a single request."""
+        self.responses = []
+        self.cnt = 0
+        self.commands = list(commands)
+        self.new_cmd = True
+
+    @staticmethod
+    def read_data(
+        addr: int, commands: List[Tuple[MCMD, MDATA]], responses: List[IRESP], bus_byte_width: int
+    ) -> List[int]:
+        """Bytes returned by 'responses' to 'commands' of a read at 'addr'."""
+        data = []
+        for (command, _), response in zip(commands, responses):
+            offset = addr % bus_byte_width
+            size = 2**command.hSize
+            data += [(response.hRData >> ((offset + i) * 8)) & 0xFF for i in range(size)]
+            addr += size
+        return data
+
+
 # Generic ahb2csr test interface
 class AHBTestInterface(FrontBusTestInterface):
     """
@@ -123,7 +377,7 @@ class AHBTestInterface(FrontBusTestInterface):
         self.AHBSubordinate = DUTSubordinate(dut, bus_width=data_width)
 
         # Simulated AHB in control of dispatching commands
-        self.AHBManager = SimSimpleManager(bus_width=data_width)
+        self.AHBManager = PipelinedManager(bus_width=data_width)
 
         # Cocotb-ahb-specific construct for simulation purposes
         self.interconnect = SimInterconnect()
@@ -173,6 +427,7 @@ class AHBTestInterface(FrontBusTestInterface):
         units: str = "us",
     ) -> None:
         """Send a write request & await transfer to finish for 'timeout' in 'units'."""
+        self.invalidate_csr_cache(addr)
         if awid:
             self.dut._log.debug(f"AHB doesn't support user_id, ignoring aw_user={awid}")
         data_len = len(data)
@@ -184,6 +439,63 @@ class AHBTestInterface(FrontBusTestInterface):
         self.AHBManager.write(addr, len(strb), data, strb)
         await with_timeout(self.AHBManager.transfer_done(), timeout, units)
 
+    async def _transfer_many(self, requests, timeout, units) -> List[List[IRESP]]:
+        """
+        Issue commands of all the 'requests' back to back, with overlapping address and data
+        phases, & await them all. Returns responses to the commands of each of the requests.
+        """
+        self.AHBManager.issue([command for commands in requests for command in commands])
+        await with_timeout(self.AHBManager.transfer_done(), timeout * len(requests), units)
+        responses = iter(list(self.AHBManager.responses))
+        return [[next(responses) for _ in commands] for commands in requests]
+
+    async def read_csr_many(
+        self,
+        addrs: List[int],
+        size: int = 4,
+        arid=None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+    ) -> List[List[int]]:
+        """Issue reads of CSRs at 'addrs' back to back & await all the responses.
+        'timeout' applies to each read. AHB completes transfers in order."""
+        if arid:
+            self.dut._log.debug(f"AHB doesn't support user id, ignoring arid={arid}")
+        if not addrs:
+            return []
+        requests = [self.AHBManager.read_commands(addr, size) for addr in addrs]
+        responses = await self._transfer_many(requests, timeout, units)
+        return [
+            self.AHBManager.read_data(addr, commands, resps, self.data_byte_width)
+            for addr, commands, resps in zip(addrs, requests, responses)
+        ]
+
+    async def write_csr_many(
+        self,
+        writes: List[Tuple[int, List[int]]],
+        size: int = 4,
+        awid=None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+    ) -> None:
+        """Issue writes of (address, data) pairs back to back & await all the transfers.
+        'timeout' applies to each write. AHB completes transfers in order."""
+        if awid:
+            self.dut._log.debug(f"AHB doesn't support user_id, ignoring aw_user={awid}")
+        for addr, _ in writes:
+            self.invalidate_csr_cache(addr)
+        if not writes:
+            return
+        # Extend bytes to size if there's less than that, enable all bytes
+        strb = [1 for _ in range(size)]
+        requests = [
+            self.AHBManager.write_commands(addr, size, data + [0] * (size - len(data)), strb)
+            for addr, data in writes
+        ]
+        await self._transfer_many(requests, timeout, units)
+
 
 # Generic axi2csr test interface
 class AXITestInterface(FrontBusTestInterface):
@@ -192,6 +504,9 @@ class AXITestInterface(FrontBusTestInterface):
     common functionalities, such as read / write to CSR.
     """
 
+    # Maximum number of beats of a FIXED burst allowed by AXI
+    MAX_FIXED_BURST_LEN = 16
+
     def __init__(self, dut: SimHandleBase, data_width=32):
         super().__init__(dut, dut.aclk, dut.areset_n, data_width)
 
@@ -231,12 +546,117 @@ class AXITestInterface(FrontBusTestInterface):
         units: str = "us",
     ) -> None:
         """Send a write request & await transfer to finish."""
+        self.invalidate_csr_cache(addr)
         # assert not bytes(data)
         if awid is not None:
             return await with_timeout(self.axi_m.write(addr, bytes(data), user=awid), timeout, units)
         else:
             return await with_timeout(self.axi_m.write(addr, bytes(data)), timeout, units)
 
+    @staticmethod
+    def _transaction_ids(addrs: List[int], id_count: int, ordered: bool) -> List[int]:
+        """
+        Assign AXI IDs to accesses to 'addrs'. AXI only orders transactions with the same ID:
+        with 'ordered' all accesses share the ID & take effect in order. Otherwise only
+        accesses to the same address (e.g. FIFO data ports) share the ID, other accesses get
+        distinct IDs and may complete in any order, which is only safe for registers whose
+        accesses don't affect each other (e.g. independent RW configuration registers, not
+        command / status registers or anything with read or write side effects).
+        """
+        if ordered:
+            return [0] * len(addrs)
+        ids = {}
+        for addr in addrs:
+            ids.setdefault(addr, len(ids) % id_count)
+        return [ids[addr] for addr in addrs]
+
+    async def read_csr_many(
+        self,
+        addrs: List[int],
+        size: int = 4,
+        arid: int = None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+        ret_data_only=True,
+    ) -> List[List[int]]:
+        """Issue reads of CSRs at 'addrs' back to back, with multiple reads in flight,
+        & await all the responses. 'timeout' applies to each read. Reads take effect in order
+        unless 'ordered' is disabled, see _transaction_ids."""
+        user = {} if arid is None else {"user": arid}
+        ids = self._transaction_ids(addrs, self.axi_m.read_if.id_count, ordered)
+        events = [
+            self.axi_m.init_read(addr, size, arid=tid, **user) for addr, tid in zip(addrs, ids)
+        ]
+        await with_timeout(Combine(*[e.wait() for e in events]), timeout * len(addrs), units)
+        if ret_data_only:
+            return [e.data.data for e in events]
+        return [e.data for e in events]
+
+    async def write_csr_many(
+        self,
+        writes: List[Tuple[int, List[int]]],
+        size: int = 4,
+        awid: int = None,
+        timeout: int = 1,
+        units: str = "us",
+        ordered: bool = True,
+    ) -> None:
+        """Issue writes of (address, data) pairs back to back, with multiple writes in flight,
+        & await all the transfers to finish. 'timeout' applies to each write. Writes take
+        effect in order unless 'ordered' is disabled, see _transaction_ids."""
+        for addr, _ in writes:
+            self.invalidate_csr_cache(addr)
+        user = {} if awid is None else {"user": awid}
+        ids = self._transaction_ids(
+            [addr for addr, _ in writes], self.axi_m.write_if.id_count, ordered
+        )
+        events = [
+            self.axi_m.init_write(addr, bytes(data), awid=tid, **user)
+            for (addr, data), tid in zip(writes, ids)
+        ]
+        await with_timeout(Combine(*[e.wait() for e in events]), timeout * len(writes), units)
+
+    async def write_fifo(
+        self, addr: int, data: List[int], awid: int = None, timeout: int = 1, units: str = "us"
+    ) -> None:
+        """Write 'data' bytes to the FIFO data port at 'addr' as FIXED bursts issued back to back
+        & await all the transfers. Data is padded with zeros to whole dwords, 'timeout' applies
+        to each dword."""
+        self.invalidate_csr_cache(addr)
+        data = pad_to_dwords(data)
+        if not data:
+            return
+        user = {} if awid is None else {"user": awid}
+        chunk = self.MAX_FIXED_BURST_LEN * 4
+        # Bursts share the AXI ID, so that they're written to the FIFO in order
+        events = [
+            self.axi_m.init_write(
+                addr, data[i : i + chunk], awid=0, burst=AxiBurstType.FIXED, size=2, **user
+            )
+            for i in range(0, len(data), chunk)
+        ]
+        await with_timeout(Combine(*[e.wait() for e in events]), timeout * len(data) // 4, units)
+
+    async def read_fifo(
+        self, addr: int, count: int, arid: int = None, timeout: int = 1, units: str = "us"
+    ) -> List[int]:
+        """Read 'count' dwords from the FIFO data port at 'addr' as FIXED bursts issued
+        back to back. Returns the read bytes, 'timeout' applies to each dword."""
+        if not count:
+            return []
+        user = {} if arid is None else {"user": arid}
+        bursts = [
+            min(self.MAX_FIXED_BURST_LEN, count - i)
+            for i in range(0, count, self.MAX_FIXED_BURST_LEN)
+        ]
+        events = [
+            self.axi_m.init_read(addr, 4 * n, arid=0, burst=AxiBurstType.FIXED, size=2, **user)
+            for n in bursts
+        ]
+        await with_timeout(Combine(*[e.wait() for e in events]), timeout * count, units)
+        return list(b"".join(e.data.data for e in events))
+
     def _report_response(self, got, expected, is_read=False):
         op = "read" if is_read else "write"
         name = ["OKAY", "EXOKAY", "SLVERR", "DECERR"]
@@ -245,30 +665,32 @@ class AXITestInterface(FrontBusTestInterface):
             f" Anticipated {op} response: {name[expected]} got: {name[got]}."
         )
 
+    def _id_filter_config(self):
+        priv_ids = [int(priv_id) for priv_id in self.dut.priv_ids_i.value]
+        return bool(self.dut.disable_id_filtering_i.value), priv_ids
+
+    def _check_access_response(self, transaction: AxiTransaction) -> None:
+        """Check response to 'transaction' against the filtering config at its request."""
+        filter_off, priv_ids = transaction.info
+        expected = AxiResp.OKAY
+        if not filter_off and transaction.user not in priv_ids:
+            expected = AxiResp.SLVERR
+        is_read = not transaction.write
+        assert transaction.resp == expected, self._report_response(
+            transaction.resp, expected, is_read
+        )
+        if is_read and expected == AxiResp.SLVERR:
+            assert all(data == 0 for data in transaction.data)
+
     async def read_access_monitor(self):
         """
         Ensures the AXI read response is set appropriately to
         current filtering configuration and transaction ID.
         """
         await RisingEdge(self.dut.areset_n)
-
-        while True:
-            while not (self.dut.arvalid.value and self.dut.arready.value):
-                await RisingEdge(self.dut.aclk)
-            priv_ids = self.dut.priv_ids_i.value
-            filter_off = self.dut.disable_id_filtering_i.value
-
-            while not (self.dut.rvalid.value and self.dut.rready.value):
-                await RisingEdge(self.dut.aclk)
-            rid = self.dut.aruser.value
-            rresp = self.dut.rresp.value
-            if filter_off or rid in priv_ids:
-                assert rresp == AxiResp.OKAY, self._report_response(rresp, AxiResp.OKAY, True)
-            else:
-                assert rresp == AxiResp.SLVERR, self._report_response(rresp, AxiResp.SLVERR, True)
-                assert self.dut.rdata.value == 0
-
-            await RisingEdge(self.dut.aclk)
+        monitor = AxiTransactionMonitor(self.dut, self.clk, self._id_filter_config)
+        monitor.add_callback(self._check_access_response)
+        await monitor.monitor_reads()
 
     async def write_access_monitor(self):
         """
@@ -276,24 +698,123 @@ class AXITestInterface(FrontBusTestInterface):
         current filtering configuration and transaction ID.
         """
         await RisingEdge(self.dut.areset_n)
+        monitor = AxiTransactionMonitor(self.dut, self.clk, self._id_filter_config)
+        monitor.add_callback(self._check_access_response)
+        await monitor.monitor_writes()
 
-        while True:
-            while not (self.dut.awvalid.value and self.dut.awready.value):
-                await RisingEdge(self.dut.aclk)
-            priv_ids = self.dut.priv_ids_i.value
-            filter_off = self.dut.disable_id_filtering_i.value
+    def transaction_monitor(self) -> AxiTransactionMonitor:
+        """Start recording all AXI transactions on the bus, returns the monitor."""
+        return AxiTransactionMonitor(self.dut, self.clk).start()
+
+
+class AXILiteTestInterface(AXITestInterface):
+    """
+    AXI test interface with a minimal native driver in place of AxiMaster. Each access is
+    a single-beat transfer driven directly on the AW/W/B or AR/R channels, with a single await
+    per clock cycle. Accesses aren't pipelined: multiple accesses, including FIFO transfers,
+    are issued one by one.
+    """
 
-            while not (self.dut.bvalid.value and self.dut.bready.value):
-                await RisingEdge(self.dut.aclk)
-            bid = self.dut.awuser.value
-            bresp = self.dut.bresp.value
+    read_csr_many = FrontBusTestInterface.read_csr_many
+    write_csr_many = FrontBusTestInterface.write_csr_many
+    read_fifo = FrontBusTestInterface.read_fifo
+    write_fifo = FrontBusTestInterface.write_fifo
 
-            if filter_off or bid in priv_ids:
-                assert bresp == AxiResp.OKAY, self._report_response(bresp, AxiResp.OKAY)
-            else:
-                assert bresp == AxiResp.SLVERR, self._report_response(bresp, AxiResp.SLVERR)
+    def __init__(self, dut: SimHandleBase, data_width=32):
+        FrontBusTestInterface.__init__(self, dut, dut.aclk, dut.areset_n, data_width)
+
+        # Read & write channels are independent, accesses on each of them are serialized
+        self.read_lock = Lock()
+        self.write_lock = Lock()
+        for name in ["arvalid", "rready", "awvalid", "wvalid", "bready", "arlock", "awlock"]:
+            getattr(self.dut, name).value = 0
+
+    async def read_csr(
+        self,
+        addr: int,
+        size: int = 4,
+        arid: int = None,
+        timeout: int = 1,
+        units: str = "us",
+        ret_data_only=True,
+    ) -> List[int]:
+        """Send a read request & await the response."""
+        async with self.read_lock:
+            resp = await with_timeout(self._read(addr, size, arid or 0), timeout, units)
+        if ret_data_only:
+            return resp.data
+        return resp
+
+    async def write_csr(
+        self,
+        addr: int,
+        data: List[int],
+        size: int = 4,
+        awid: int = None,
+        timeout: int = 1,
+        units: str = "us",
+    ) -> None:
+        """Send a write request & await transfer to finish."""
+        self.invalidate_csr_cache(addr)
+        async with self.write_lock:
+            return await with_timeout(self._write(addr, bytes(data), awid or 0), timeout, units)
+
+    async def _read(self, addr: int, size: int, user: int) -> AxiReadResp:
+        offset = addr % self.data_byte_width
+        assert offset + size <= self.data_byte_width, "Only single-beat reads are supported"
+        dut = self.dut
+        dut.araddr.value = addr
+        dut.arid.value = 0
+        dut.arlen.value = 0
+        dut.arsize.value = int(log2(self.data_byte_width))
+        dut.arburst.value = AxiBurstType.INCR
+        dut.aruser.value = user
+        dut.arvalid.value = 1
+        dut.rready.value = 1
+
+        while True:
+            await RisingEdge(self.clk)
+            if dut.arready.value:
+                dut.arvalid.value = 0
+            if dut.rvalid.value:
+                break
+        dut.rready.value = 0
+
+        data = int(dut.rdata.value).to_bytes(self.data_byte_width, "little")
+        return AxiReadResp(
+            addr, data[offset : offset + size], AxiResp(int(dut.rresp.value)), int(dut.ruser.value)
+        )
+
+    async def _write(self, addr: int, data: bytes, user: int) -> AxiWriteResp:
+        offset = addr % self.data_byte_width
+        assert offset + len(data) <= self.data_byte_width, "Only single-beat writes are supported"
+        dut = self.dut
+        dut.awaddr.value = addr
+        dut.awid.value = 0
+        dut.awlen.value = 0
+        dut.awsize.value = int(log2(self.data_byte_width))
+        dut.awburst.value = AxiBurstType.INCR
+        dut.awuser.value = user
+        dut.awvalid.value = 1
+        dut.wdata.value = int.from_bytes(data, "little") << (offset * 8)
+        dut.wstrb.value = ((1 << len(data)) - 1) << offset
+        dut.wuser.value = user
+        dut.wlast.value = 1
+        dut.wvalid.value = 1
+        dut.bready.value = 1
+
+        # Address & data are issued at once, the response follows both handshakes
+        while True:
+            await RisingEdge(self.clk)
+            if dut.awready.value:
+                dut.awvalid.value = 0
+            if dut.wready.value:
+                dut.wvalid.value = 0
+            if dut.bvalid.value:
+                break
+        dut.bready.value = 0
 
-            await RisingEdge(self.dut.aclk)
+        return AxiWriteResp(addr, len(data), AxiResp(int(dut.bresp.value)), int(dut.buser.value))
 
 
 def get_frontend_bus_if():
@@ -301,7 +822,7 @@ def get_frontend_bus_if():
     This function returns one of the defined `FrontBusTestInterface`.
     """
     frontend_bus_name = cocotb.plusargs["FrontendBusInterface"]
-    assert frontend_bus_name in ["AXI", "AHB"]
+    assert frontend_bus_name in ["AXI", "AXILite", "AHB"]
     cls_name = frontend_bus_name + "TestInterface"
     try:
         cls = getattr(import_module("bus2csr"), cls_name)
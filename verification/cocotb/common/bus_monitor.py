@@ -1,10 +1,101 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import cocotb
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import Edge, First, RisingEdge
+
+
+class _Detector:
+    """
+    Model of a bus monitor detector driving 'output'. When triggered, the detector checks
+    that 'line' stays at 'level' for the number of cycles read from 'delay' & then reports
+    the event. Pulse detectors report it for a single cycle, level detectors until 'line'
+    leaves 'level'.
+    """
+
+    def __init__(self, output, delay, level: int, pulse: bool):
+        self.output = output
+        self.delay = delay
+        self.level = level
+        self.pulse = pulse
+        # Value driven to the output, None until driven
+        self.value = None
+        # Cycles of the stability check left, None when not checking
+        self.remaining = None
+
+    @property
+    def idle(self) -> bool:
+        """Whether the detector won't change its output until triggered."""
+        return self.remaining is None and not (self.pulse and self.value)
+
+    def _drive(self, value: int) -> None:
+        if value != self.value:
+            self.output.value = value
+            self.value = value
+
+    def step(self, line: int, triggered: bool) -> None:
+        """Advance the detector by a clock cycle, given 'line' sampled in it."""
+        if self.remaining is None:
+            value = 0 if self.pulse or line != self.level else self.value
+            if triggered:
+                delay = int(self.delay.value)
+                if delay:
+                    # The line is at the level in this cycle already
+                    self.remaining = delay - 1
+                else:
+                    value = 1
+            if value is not None:
+                self._drive(value)
+        elif self.remaining == 0:
+            self.remaining = None
+            self._drive(1)
+        elif line != self.level:
+            self.remaining = None
+            if not self.pulse:
+                self._drive(0)
+        else:
+            self.remaining -= 1
+
+
+class _LineDetectors:
+    """Edge and stable level detectors of a bus line, that exist in the DUT."""
+
+    def __init__(self, line, negedge, posedge, stable_low, stable_high, t_r, t_f):
+        self.line = line
+        self.last = None
+        detectors = [
+            (negedge, t_f, 0, True),
+            (posedge, t_r, 1, True),
+            (stable_low, t_f, 0, False),
+            (stable_high, t_r, 1, False),
+        ]
+        self.negedge, self.posedge, self.stable_low, self.stable_high = [
+            None if output is None or delay is None else _Detector(output, delay, level, pulse)
+            for output, delay, level, pulse in detectors
+        ]
+        self.detectors = [
+            d for d in [self.negedge, self.posedge, self.stable_low, self.stable_high] if d
+        ]
+
+    def step(self, value: int) -> None:
+        for detector in self.detectors:
+            transition = self.last is not None and self.last != detector.level
+            detector.step(value, transition and value == detector.level)
+        self.last = value
+
+    @staticmethod
+    def active(detector) -> bool:
+        return detector is not None and bool(detector.value)
 
 
 class BusMonitor:
+    """
+    Model of the bus monitor detectors of SCL and SDA, driving their outputs to the DUT
+    inputs of the same names. All the detectors are computed from a single sample of
+    the lines in each clock cycle. Detection windows are counted in clock cycles from
+    't_r_i', 't_f_i' and 't_hd_dat_i'. While no detection is in progress, the model sleeps
+    until either of the lines changes.
+    """
+
     def __init__(self, dut):
         signals = [
             "t_r_i",
@@ -24,118 +115,55 @@ class BusMonitor:
         self.log = dut._log
         self.clk = dut.clk_i
         self.dut = dut
+        self._task = None
 
         for name in signals:
-            if hasattr(dut, name):
-                setattr(self, name[:-2], getattr(dut, name))
+            setattr(self, name[:-2], getattr(dut, name, None))
 
-    async def is_signal_stable(self, signal, value, stable_cycles):
-        """
-        Ensure that the signal is in stable state for given number of clock cycles
-        """
-        for _ in range(stable_cycles):
-            if signal != value:
-                return False
-            await RisingEdge(self.clk)
-        return True
+    def _line(self, name):
+        if not hasattr(self.dut, f"{name}_i"):
+            return None
+        ports = [getattr(self, f"{name}_{d}") for d in ["negedge", "posedge"]]
+        ports += [getattr(self, f"{name}_stable_{level}") for level in ["low", "high"]]
+        line = _LineDetectors(getattr(self.dut, f"{name}_i"), *ports, self.t_r, self.t_f)
+        return line if line.detectors else None
+
+    async def _run(self):
+        scl = self._line("scl")
+        sda = self._line("sda")
+        lines = [line for line in [scl, sda] if line is not None]
+
+        # START/STOP: SDA edge while SCL is stable HIGH, reported after SCL holds for t_hd_dat
+        conditions = []
+        if scl and sda and scl.stable_high and self.t_hd_dat is not None:
+            for output, sda_edge, scl_edge in [
+                (self.bus_start_det, sda.negedge, scl.negedge),
+                (self.bus_stop_det, sda.posedge, scl.posedge),
+            ]:
+                if output is not None and sda_edge:
+                    detector = _Detector(output, self.t_hd_dat, 1, True)
+                    conditions.append((detector, sda_edge, scl_edge))
+
+        if not lines:
+            return
+        detectors = [d for line in lines for d in line.detectors]
+        detectors += [condition for condition, _, _ in conditions]
+        edge = RisingEdge(self.clk)
 
-    async def report_negedge(self, signal, signal_negedge, t_f):
-        """
-        Coroutine to detect SCL negedge while ensuring it is stable transition
-        """
-        last_scl = signal.value
-        while True:
-            signal_negedge.value = 0  # Always LOW until SCL negedge
-            if (
-                (last_scl)
-                and (not signal.value)
-                and (await self.is_signal_stable(signal, 0, t_f.value))
-            ):
-                signal_negedge.value = 1
-            last_scl = signal.value
-            await RisingEdge(self.clk)
-
-    async def report_posedge(self, signal, signal_posedge, t_r):
-        """
-        Coroutine to detect SCL posedge while ensuring it is stable transition
-        """
-        last_scl = signal.value
-        while True:
-            signal_posedge.value = 0  # Always LOW until SCL posedge
-            if (
-                (not last_scl)
-                and (signal.value)
-                and (await self.is_signal_stable(signal, 1, t_r.value))
-            ):
-                signal_posedge.value = 1
-            last_scl = signal.value
-            await RisingEdge(self.clk)
-
-    async def report_stable_low(self, signal, signal_stable_low, t_f):
-        """
-        Coroutine to detect SCL LOW state while ensuring it is stable signal
-        """
-        last_scl = signal.value
-        while True:
-            if not signal.value:
-                # If previous SCL was HIGH, ensure it is stable LOW now
-                if last_scl:
-                    if await self.is_signal_stable(signal, 0, t_f.value):
-                        signal_stable_low.value = 1
-                    else:
-                        signal_stable_low.value = 0
-            else:  # SCL is HIGH
-                signal_stable_low.value = 0
-            last_scl = signal.value
-            await RisingEdge(self.clk)
-
-    async def report_stable_high(self, signal, signal_stable_high, t_r):
-        """
-        Coroutine to detect SCL HIGH state while ensuring it is stable signal
-        """
-        last_scl = signal.value
-        while True:
-            if signal.value:
-                # If previous SCL was LOW, ensure it is stable HIGH now
-                if not last_scl:
-                    if await self.is_signal_stable(signal, 1, t_r.value):
-                        signal_stable_high.value = 1
-                    else:
-                        signal_stable_high.value = 0
-            else:  # SCL is LOW
-                signal_stable_high.value = 0
-            last_scl = signal.value
-            await RisingEdge(self.clk)
-
-    async def report_bus_start_condition(
-        self, start_det, sda_negedge, scl_negedge, scl_stable_high
-    ):
-        """
-        Coroutine to detect the bus START condition
-        """
-        while True:
-            if (
-                (sda_negedge.value and not scl_negedge.value)
-                and scl_stable_high.value
-                and (await self.is_signal_stable(self.dut.scl_i, 1, self.t_hd_dat))
-            ):
-                start_det.value = 1
-            else:
-                start_det.value = 0
-
-    async def report_bus_stop_condition(self, stop_det, sda_posedge, scl_posedge, scl_stable_high):
-        """
-        Coroutine to detect the bus START condition
-        """
         while True:
-            if (
-                (sda_posedge.value and not scl_posedge.value)
-                and scl_stable_high.value
-                and (await self.is_signal_stable(self.dut.scl_i, 1, self.t_hd_dat))
-            ):
-                stop_det.value = 1
-            else:
-                stop_det.value = 0
+            for line in lines:
+                line.step(int(line.line.value))
+            for condition, sda_edge, scl_edge in conditions:
+                triggered = (
+                    sda.active(sda_edge)
+                    and not scl.active(scl_edge)
+                    and scl.active(scl.stable_high)
+                )
+                condition.step(scl.last, triggered)
+
+            if all(d.idle for d in detectors):
+                await First(*[Edge(line.line) for line in lines])
+            await edge
 
     def start(self):
         """
@@ -151,84 +179,12 @@ class BusMonitor:
         - Bus START condition
         - Bus STOP condition
 
-        Bus events are reported after ensuring that they are in stable state.
+        Bus events are reported after ensuring that they are in stable state. Detectors
+        whose ports are missing in the DUT aren't modeled.
         """
-        # SCL
-        try:
-            cocotb.start_soon(self.report_negedge(self.dut.scl_i, self.scl_negedge, self.t_r))
-        except AttributeError:
-            self.log.debug(
-                "SCL stable HIGH detector not spawned, DUT does not contain `t_r_i` or `scl_posedge` ports"
-            )
-        try:
-            cocotb.start_soon(self.report_posedge(self.dut.scl_i, self.scl_posedge, self.t_f))
-        except AttributeError:
-            self.log.debug(
-                "SCL stable LOW detector not spawned, DUT does not contain `t_f_i` or `scl_negedge` ports"
-            )
-        try:
-            cocotb.start_soon(self.report_stable_low(self.dut.scl_i, self.scl_stable_low, self.t_r))
-        except AttributeError:
-            self.log.debug(
-                "SCL posedge detector not spawned, DUT does not contain `t_r_i` or `scl_posedge` ports"
-            )
-        try:
-            cocotb.start_soon(
-                self.report_stable_high(self.dut.scl_i, self.scl_stable_high, self.t_f)
-            )
-        except AttributeError:
-            self.log.debug(
-                "SCL negedge detector not spawned, DUT does not contain `t_f_i` or `scl_negedge` ports"
-            )
-
-        # SDA
-        try:
-            cocotb.start_soon(self.report_negedge(self.dut.sda_i, self.sda_negedge, self.t_r))
-        except AttributeError:
-            self.log.debug(
-                "SDA stable HIGH detector not spawned, DUT does not contain `t_r_i` or `sda_posedge` ports"
-            )
-        try:
-            cocotb.start_soon(self.report_posedge(self.dut.sda_i, self.sda_posedge, self.t_f))
-        except AttributeError:
-            self.log.debug(
-                "SDA stable LOW detector not spawned, DUT does not contain `t_f_i` or `sda_negedge` ports"
-            )
-        try:
-            cocotb.start_soon(self.report_stable_low(self.dut.sda_i, self.sda_stable_low, self.t_r))
-        except AttributeError:
-            self.log.debug(
-                "SDA posedge detector not spawned, DUT does not contain `t_r_i` or `sda_posedge` ports"
-            )
-        try:
-            cocotb.start_soon(
-                self.report_stable_high(self.dut.sda_i, self.sda_stable_high, self.t_f)
-            )
-        except AttributeError:
-            self.log.debug(
-                "SDA negedge detector not spawned, DUT does not contain `t_f_i` or `sda_negedge` ports"
-            )
-
-        # Bus conditions
-        try:
-            cocotb.start_soon(
-                self.report_bus_start_condition(
-                    self.start_det, self.sda_negedge, self.scl_negedge, self.scl_stable_high
-                )
-            )
-        except AttributeError:
-            self.log.debug(
-                "Bus START condition detector not spawned, DUT does not contain one of the following ports: "
-                "bus_start_det_i, sda_negedge_i, scl_negedge_i, scl_stable_high_i"
-            )
-        try:
-            cocotb.start_soon(
-                self.report_bus_stop_condition(
-                    self.stop_det, self.sda_posedge, self.scl_posedge, self.scl_stable_high
-                )
-            )
-        except AttributeError:
-            self.log.debug(
-                "Bus STOP condition detector not spawned, DUT does not contain one of the following ports: "
-                "bus_stop_det_i, sda_posedge_i, scl_posedge_i, scl_stable_high_i"
-            )
+        self._task = cocotb.start_soon(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
@@ -0,0 +1,176 @@
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from reg_map import reg_map
+
+from cocotb.handle import SimHandleBase
+from cocotb.triggers import FallingEdge
+from cocotb.utils import get_sim_time
+
+I3C_ROOT_DIR = Path(os.getenv("I3C_ROOT_DIR", Path(__file__).resolve().parents[3]))
+CSR_SOURCE = I3C_ROOT_DIR / "src" / "csr" / "I3CCSR.sv"
+CSR_PKG_SOURCE = I3C_ROOT_DIR / "src" / "csr" / "I3CCSR_pkg.sv"
+
+
+@lru_cache
+def storage_layout(source: Path = CSR_SOURCE) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse 'field_storage_t' of the generated CSR block. Returns (low bit, width) of storage
+    of each field within the packed struct keyed by the upper case path of the field, which
+    matches reg_map, e.g. "I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.STATIC_ADDR".
+    """
+    lines = Path(source).read_text().splitlines()
+    end = next(i for i, line in enumerate(lines) if re.match(r"\s*} field_storage_t;", line))
+    start = max(i for i in range(end) if re.match(r"\s*typedef struct packed\s*{", lines[i]))
+
+    # Nested structs as lists of (name, member), where member is a list or a width in bits
+    stack = [[]]
+    for line in lines[start + 1 : end]:
+        if re.match(r"\s*struct packed\s*{", line):
+            stack.append([])
+        elif m := re.match(r"\s*logic\s*(?:\[(\d+):(\d+)\])?\s*(\w+);", line):
+            width = int(m[1]) - int(m[2]) + 1 if m[1] else 1
+            stack[-1].append((m[3], width))
+        elif m := re.match(r"\s*}\s*(\w+);", line):
+            members = stack.pop()
+            stack[-1].append((m[1], members))
+
+    def width(member):
+        return member if isinstance(member, int) else sum(width(m) for _, m in member)
+
+    layout = {}
+
+    def place(members, top, path):
+        # Members of packed structs are placed from the MSB down, 'top' is above the MSB
+        for name, member in members:
+            if name == "value":
+                layout[path] = (top - member, member)
+            elif not isinstance(member, int):
+                place(member, top, f"{path}.{name.upper()}".lstrip("."))
+            top -= width(member)
+
+    place(stack[0], width(stack[0]), "")
+    return layout
+
+
+@lru_cache
+def accessed_fields(source: Path = CSR_PKG_SOURCE) -> Set[str]:
+    """
+    Parse hardware interface types of the generated CSR package. Returns paths of fields,
+    in the format of storage_layout(), that notify hardware of software accesses.
+    """
+    fields = set()
+    notified = False
+    for line in Path(source).read_text().splitlines():
+        if re.match(r"\s*typedef struct packed\s*{", line):
+            notified = False
+        elif re.match(r"\s*logic\s+(swmod|swacc);", line):
+            notified = True
+        elif m := re.match(r"\s*}\s*I3CCSR__(\w+)__out_t;", line):
+            if notified:
+                fields.add(m[1].replace("__", ".").upper())
+    return fields
+
+
+def _reg_fields(regs, path="") -> Dict[int, List[Tuple[str, dict]]]:
+    """Collect (path, field) pairs of each register in 'regs' keyed by the register address."""
+    fields = {}
+    for name, node in regs.items():
+        if not isinstance(node, dict):
+            continue
+        reg_fields = [
+            (f"{path}{name}.{f_name}", f)
+            for f_name, f in node.items()
+            if isinstance(f, dict) and "mask" in f
+        ]
+        if reg_fields and "base_addr" in node:
+            fields[node.base_addr] = reg_fields
+        else:
+            fields.update(_reg_fields(node, f"{path}{name}."))
+    return fields
+
+
+class CSRBackdoor:
+    """
+    Access to CSRs through the field storage of the CSR block. Reads take zero simulation
+    time, writes wait for a falling edge of 'clk', see write_csr().
+
+    Only registers whose fields are all stored in the block or constant are accessible.
+    Accesses have none of the bus access side effects, so registers with fields cleared on
+    read or write-one, or fields notifying hardware of accesses aren't accessible either.
+    """
+
+    def __init__(
+        self,
+        storage: SimHandleBase,
+        clk: SimHandleBase,
+        regs=reg_map,
+        source: Path = CSR_SOURCE,
+        pkg_source: Path = CSR_PKG_SOURCE,
+    ):
+        self.storage = storage
+        self.clk = clk
+        # Time step of the falling edge the storage has been last written at
+        self._write_step = None
+        layout = storage_layout(source)
+        accessed = accessed_fields(pkg_source)
+        # Fields of each accessible register with (low bit, width) of their storage,
+        # None for constant fields
+        self.regs = {}
+        for addr, fields in _reg_fields(regs).items():
+            reg = []
+            for path, field in fields:
+                if field.woclr or field.rclr or path in accessed:
+                    break
+                if path in layout:
+                    reg.append((field, layout[path]))
+                elif "w" not in field.sw and "w" not in field.hw:
+                    reg.append((field, None))
+                else:
+                    break
+            else:
+                self.regs[addr] = reg
+
+    def supports(self, addr: int) -> bool:
+        return addr in self.regs
+
+    def read_csr(self, addr: int) -> int:
+        """Read value of CSR at 'addr' from the field storage."""
+        storage = int(self.storage.value)
+        value = 0
+        for field, bits in self.regs[addr]:
+            if bits is None:
+                data = field.reset
+            else:
+                low, width = bits
+                data = (storage >> low) & ((1 << width) - 1)
+            # Write-only fields read back as zeros
+            if "r" in field.sw:
+                value |= (data << field.low) & field.mask
+        return value
+
+    async def write_csr(self, addr: int, value: int, mask: int = 0xFFFFFFFF) -> None:
+        """
+        Write bits of 'value' selected by 'mask' to the storage of software writable fields
+        of CSR at 'addr'. The storage is written as a whole, so the write waits for a falling
+        edge of the clock, where hardware doesn't update any field, lest updates made in the
+        same time step are lost. Writes in the time step of the previous write don't wait.
+        """
+        if get_sim_time("step") != self._write_step:
+            await FallingEdge(self.clk)
+            self._write_step = get_sim_time("step")
+        storage = int(self.storage.value)
+        for field, bits in self.regs[addr]:
+            if bits is None or "w" not in field.sw:
+                continue
+            low, _ = bits
+            written = (field.mask & mask) >> field.low
+            data = (value & field.mask) >> field.low
+            storage = storage & ~(written << low) | ((data & written) << low)
+        # Apply immediately, so that subsequent accesses in this time step see the new value
+        self.storage.setimmediatevalue(storage)
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+CSR access benchmark. Measures cost of CSR accesses of a bus test interface in clock cycles
+& stores the results per configuration in a JSON file, so that they can be compared between
+runs. Results are written to CSR_BENCH_RESULTS (default: csr_bench_results.json in the test
+directory). If CSR_BENCH_BASELINE is set, results are checked against the ones stored there
+for the same configuration with CSR_BENCH_TOLERANCE (default: 0.1) relative tolerance.
+"""
+
+import json
+import os
+import random
+from typing import Dict, Optional
+
+from bus2csr import FrontBusTestInterface, dword2int, int2dword
+from cocotbext.axi import AxiResp
+
+import cocotb
+from cocotb.triggers import RisingEdge
+from cocotb.utils import get_sim_time
+
+# Number of accesses of each measurement
+NUM_ACCESSES = 32
+# Unprivileged AXI user ID used to measure rejection by the ID filter
+REJECTED_ID = 0xFF
+
+
+async def clock_period(clk) -> float:
+    """Measure period of 'clk' in ns."""
+    await RisingEdge(clk)
+    start = get_sim_time("ns")
+    await RisingEdge(clk)
+    return get_sim_time("ns") - start
+
+
+class CsrBench:
+    def __init__(self, tb: FrontBusTestInterface, period: float):
+        self.tb = tb
+        self.period = period
+        self.results: Dict[str, Optional[float]] = {}
+
+    async def measure(self, name: str, coro, count: int = 1):
+        """Await 'coro' & record cycles it took per each of 'count' accesses."""
+        start = get_sim_time("ns")
+        ret = await coro
+        self.results[name] = (get_sim_time("ns") - start) / self.period / count
+        cocotb.log.info(f"{name}: {self.results[name]:.2f}")
+        return ret
+
+    async def single(self, addr: int):
+        """Cycles per single read and write access."""
+        values = [random.randint(0, 2**32 - 1) for _ in range(NUM_ACCESSES)]
+
+        async def writes():
+            for value in values:
+                await self.tb.write_csr(addr, int2dword(value))
+
+        async def reads():
+            return [dword2int(await self.tb.read_csr(addr)) for _ in values]
+
+        await self.measure("write_cycles", writes(), len(values))
+        await self.measure("read_cycles", reads(), len(values))
+
+    async def pipelined(self, addrs):
+        """Cycles per access of accesses issued back to back. 'addrs' must be independent
+        RW registers, as the accesses may be reordered."""
+        writes = [(addr, int2dword(random.randint(0, 2**32 - 1))) for addr in addrs]
+        await self.measure(
+            "pipelined_write_cycles", self.tb.write_csr_many(writes, ordered=False), len(writes)
+        )
+        await self.measure(
+            "pipelined_read_cycles", self.tb.read_csr_many(addrs, ordered=False), len(addrs)
+        )
+
+    async def burst(self, write_addr: int, read_addr: int = None):
+        """Cycles per dword of FIFO data port transfers."""
+        data = [random.randint(0, 255) for _ in range(4 * NUM_ACCESSES)]
+        await self.measure("burst_write_cycles", self.tb.write_fifo(write_addr, data), NUM_ACCESSES)
+        if read_addr is None:
+            return
+        read = await self.measure(
+            "burst_read_cycles", self.tb.read_fifo(read_addr, NUM_ACCESSES), NUM_ACCESSES
+        )
+        assert list(read) == data, "Data read from the FIFO differs from the data written"
+
+    async def id_filter_rejection(self, addr: int):
+        """Cycles to reject an access of an unprivileged AXI ID."""
+        dut = self.tb.dut
+        dut.disable_id_filtering_i.value = 0
+        dut.priv_ids_i.value = [REJECTED_ID - 1 - i for i in range(len(dut.priv_ids_i))]
+        await RisingEdge(self.tb.clk)
+        resp = await self.measure(
+            "id_filter_reject_cycles",
+            self.tb.read_csr(addr, arid=REJECTED_ID, ret_data_only=False),
+        )
+        assert resp.resp == AxiResp.SLVERR, f"Access of ID {REJECTED_ID:#x} wasn't rejected"
+        dut.disable_id_filtering_i.value = 1
+        await RisingEdge(self.tb.clk)
+
+
+def config_name() -> str:
+    return os.getenv("CFG_NAME", cocotb.top._name)
+
+
+def save_results(results: Dict[str, Optional[float]], period: float) -> None:
+    """Store 'results' of the current configuration & check them against the baseline."""
+    name = config_name()
+    entry = {
+        "toplevel": cocotb.top._name,
+        "bus": cocotb.plusargs.get("FrontendBusInterface"),
+        "clock_period_ns": period,
+        **results,
+    }
+
+    path = os.getenv("CSR_BENCH_RESULTS", "csr_bench_results.json")
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+    stored[f"{name}/{cocotb.top._name}"] = entry
+    with open(path, "w") as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+
+    baseline_path = os.getenv("CSR_BENCH_BASELINE")
+    if not baseline_path:
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f).get(f"{name}/{cocotb.top._name}", {})
+    tolerance = float(os.getenv("CSR_BENCH_TOLERANCE", "0.1"))
+    slower = [
+        f"{metric}: {value:.2f} > {baseline[metric]:.2f}"
+        for metric, value in results.items()
+        if baseline.get(metric) is not None and value > baseline[metric] * (1 + tolerance)
+    ]
+    assert not slower, f"CSR access regressions of {name}: " + ", ".join(slower)
+
+
+async def run_csr_bench(
+    tb: FrontBusTestInterface, scratch_addrs, fifo_write_addr=None, fifo_read_addr=None
+):
+    """
+    Run all the measurements supported by the DUT on 'tb' & save the results. CSRs at
+    'scratch_addrs' must be plain read-write registers without side effects.
+    """
+    period = await clock_period(tb.clk)
+    bench = CsrBench(tb, period)
+
+    await bench.single(scratch_addrs[0])
+    await bench.pipelined([scratch_addrs[i % len(scratch_addrs)] for i in range(NUM_ACCESSES)])
+    if fifo_write_addr is not None:
+        await bench.burst(fifo_write_addr, fifo_read_addr)
+    if hasattr(tb.dut, "disable_id_filtering_i") and hasattr(tb.dut, "priv_ids_i"):
+        await bench.id_filter_rejection(scratch_addrs[0])
+
+    save_results(bench.results, period)
+    return bench.results
@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from utils import SequenceFailed
+from utils import SequenceFailed, gated_on
 
 from cocotb.triggers import ClockCycles, FallingEdge, RisingEdge, with_timeout
 
@@ -173,6 +173,7 @@ def init_i2c_target_ports(dut, address):
     dut.target_enable_i.value = 1
 
 
+@gated_on(lambda dut: [dut.controller_standby_i2c.acq_fifo_valid_int])
 def MatchOTAcqDataExact(value: int, dut: Any, mask: int = 0x3FF) -> bool:
     """Sequence predicate: Match data in ACQ queue"""
     if dut.controller_standby_i2c.acq_fifo_valid_int.value:
@@ -185,6 +186,7 @@ def MatchOTAcqDataExact(value: int, dut: Any, mask: int = 0x3FF) -> bool:
     return False
 
 
+@gated_on(lambda dut: [dut.rx_queue_wvalid_o])
 def MatchTTIDataExact(value: int, dut: Any, mask: int = 0xFFFF_FFFF) -> bool:
     """Sequence predicate: Match data in TTI RX queue"""
     if dut.rx_queue_wvalid_o.value:
@@ -196,6 +198,7 @@ def MatchTTIDataExact(value: int, dut: Any, mask: int = 0xFFFF_FFFF) -> bool:
     return False
 
 
+@gated_on(lambda dut: [dut.rx_desc_queue_wvalid_o])
 def MatchTTIResponseExact(byte_count: int, dut: Any) -> bool:
     """Sequence predicate: Match byte count in TTI response queue"""
     if dut.rx_desc_queue_wvalid_o.value:
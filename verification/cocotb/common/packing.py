@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Conversions between integers, byte sequences and arrays of little-endian dwords, as
+transferred through the CSR data ports. Built on int.to_bytes()/int.from_bytes() and
+struct, so that whole payloads are converted at once instead of byte by byte.
+"""
+
+import struct
+from typing import Iterable, List, Sequence, Tuple
+
+DWORD_MASK = 0xFFFFFFFF
+
+
+def int2bytes(value: int, byte_width: int = 4) -> List[int]:
+    assert 0 <= value and not (
+        value >> (byte_width * 8)
+    ), f"Requested int: {value:#x} exceeds {byte_width:#x} bytes."
+    return list(value.to_bytes(byte_width, "little"))
+
+
+def bytes2int(data: Sequence[int], byte_width: int = 4) -> int:
+    return int.from_bytes(bytes(data[:byte_width]), "little")
+
+
+def int2dword(value: int) -> List[int]:
+    return int2bytes(value, 4)
+
+
+def dword2int(data: Sequence[int]) -> int:
+    return bytes2int(data, 4)
+
+
+def pad_to_dwords(data: Sequence[int]) -> bytes:
+    """Return 'data' bytes padded with zeros to whole dwords."""
+    data = bytes(data)
+    return data + bytes(-len(data) % 4)
+
+
+def bytes2dwords(data: Sequence[int]) -> List[int]:
+    """Pack 'data' bytes into little-endian dwords, the last one padded with zeros."""
+    data = pad_to_dwords(data)
+    return list(struct.unpack(f"<{len(data) // 4}I", data))
+
+
+def dwords2bytes(dwords: Iterable[int], length: int = None) -> List[int]:
+    """Unpack little-endian 'dwords' into bytes, truncated to 'length' if given."""
+    dwords = list(dwords)
+    return list(struct.pack(f"<{len(dwords)}I", *dwords)[:length])
+
+
+def tail_mask(length: int) -> int:
+    """Mask of valid bytes of the last dword of 'length' bytes of data."""
+    return (1 << ((length - 1) % 4 + 1) * 8) - 1 if length else 0
+
+
+def bytes2masked_dwords(data: Sequence[int]) -> List[Tuple[int, int]]:
+    """Pack 'data' bytes into (dword, mask of valid bytes) pairs."""
+    dwords = bytes2dwords(data)
+    masks = [DWORD_MASK] * len(dwords)
+    if masks:
+        masks[-1] = tail_mask(len(data))
+    return list(zip(dwords, masks))
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark of the packing module against the byte by byte conversions it replaced.
+Does not need a simulator, run with: python packing_bench.py [payload size in bytes ...]
+"""
+
+import random
+import sys
+import timeit
+from functools import reduce
+from math import log2
+
+import packing
+
+
+def legacy_int2bytes(value, byte_width=4):
+    assert value == 0 or log2(value) <= byte_width * 8
+    return [(value >> (b * 8)) & 0xFF for b in range(byte_width)]
+
+
+def legacy_bytes2int(data, byte_width=4):
+    return reduce(lambda acc, bi: acc + (bi[0] << (bi[1] * 8)), zip(data, range(byte_width)), 0)
+
+
+def legacy_bytes2dwords(data):
+    xfer = []
+    dword = 0
+    for i, d in enumerate(data):
+        dword = dword | (d << (8 * (i % 4)))
+        if (not ((i + 1) % 4) and i) or (i == len(data) - 1):
+            xfer.append(dword)
+            dword = 0
+    return xfer
+
+
+def legacy_dwords2bytes(dwords):
+    return [b for d in dwords for b in legacy_int2bytes(d)]
+
+
+def legacy_split_into_dwords(data):
+    def or_null(d, idx):
+        return d[idx] if idx < len(d) else 0
+
+    byte_idx = 0
+    while byte_idx < len(data):
+        dword = (
+            (or_null(data, byte_idx + 3) << 24)
+            | (or_null(data, byte_idx + 2) << 16)
+            | (or_null(data, byte_idx + 1) << 8)
+            | (or_null(data, byte_idx + 0) << 0)
+        )
+        yield dword, (1 << min(len(data) - byte_idx, 4) * 8) - 1
+        byte_idx += 4
+
+
+def bench(name, legacy, new, number):
+    assert legacy() == new(), f"{name}: results differ"
+    t_legacy = timeit.timeit(legacy, number=number) / number
+    t_new = timeit.timeit(new, number=number) / number
+    print(f"{name:<22} {t_legacy * 1e6:10.1f} us {t_new * 1e6:10.1f} us {t_legacy / t_new:8.1f}x")
+
+
+def main(sizes):
+    print(f"{'':<22} {'legacy':>13} {'packing':>13} {'speedup':>9}")
+    for size in sizes:
+        data = [random.randint(0, 255) for _ in range(size)]
+        dwords = packing.bytes2dwords(data)
+        number = max(1, 200000 // size)
+        print(f"-- {size} bytes")
+        bench(
+            "bytes -> dwords",
+            lambda: legacy_bytes2dwords(data),
+            lambda: packing.bytes2dwords(data),
+            number,
+        )
+        bench(
+            "dwords -> bytes",
+            lambda: legacy_dwords2bytes(dwords),
+            lambda: packing.dwords2bytes(dwords),
+            number,
+        )
+        bench(
+            "bytes -> masked dwords",
+            lambda: list(legacy_split_into_dwords(data)),
+            lambda: packing.bytes2masked_dwords(data),
+            number,
+        )
+        bench(
+            "dword round trip",
+            lambda: [legacy_bytes2int(legacy_int2bytes(d)) for d in dwords],
+            lambda: [packing.dword2int(packing.int2dword(d)) for d in dwords],
+            number,
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1024, 4096, 16384])
@@ -2,16 +2,18 @@
 
 import os
 from enum import IntEnum
-from itertools import chain
 from math import ceil, log2
 from random import choice, randint
 from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar, Union
 
 import colorama
 import functools
+from cocotb_helpers import WaitMatch, wait_for
+from packing import bytes2dwords, bytes2masked_dwords
 
 import cocotb
-from cocotb.triggers import ClockCycles, ReadOnly, RisingEdge, with_timeout
+from cocotb.triggers import ClockCycles, Edge, First, ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
 
 _T = TypeVar("_T")
 
@@ -94,13 +96,10 @@ def clog2(val: int):
     return ceil(log2(val))
 
 
-async def expect_with_timeout(signal, expected, clk, timeout: int = 2, units: str = "ms"):
-    async def wait_cond():
-        while signal.value != expected:
-            await RisingEdge(clk)
-
-    # Apply timeout
-    await with_timeout(wait_cond(), timeout, units)
+async def expect_with_timeout(
+    signal, expected, clk, timeout: int = 2, units: str = "ms"
+) -> WaitMatch:
+    return await wait_for(signal, lambda value: value == expected, timeout, units, clk)
 
 
 def rand_bits(width):
@@ -155,180 +154,278 @@ class SequenceRetry(Exception):
         super().__init__(*args)
 
 
-def _next_or_none(it: Iterator[_T]) -> Optional[_T]:
-    try:
-        return it.__next__()
-    except StopIteration:
-        return None
+Predicate = Callable[[Any], bool]
 
 
-class Sequence:
-    def __init__(
-        self, sequence: Union[Iterable[Callable[[Any], bool]], Callable[[Any], bool]] = []
-    ):
-        if isinstance(sequence, Iterable):
-            self.sequence = sequence
-        else:
-            self.sequence = [sequence]
+def gated_on(gates: Callable[[Any], Iterable[Any]]) -> Callable[[Predicate], Predicate]:
+    """
+    Decorator of sequence predicates, declaring handles of the DUT the predicate is gated
+    on. 'gates' returns the handles given the DUT. While all of them are 0, the predicate
+    has to return False without side effects, so Sequence.match() sleeps until either of
+    them changes instead of evaluating the predicate in each cycle.
+    """
 
-    def __add__(self, other: "Sequence") -> "Sequence":
-        return Sequence(chain(self.sequence, other.sequence))
-
-    class OrSeqState(Iterable[Callable[[Any], bool]]):
-        def __init__(
-            self, s1: Iterable[Callable[[Any], bool]], s2: Iterable[Callable[[Any], bool]]
-        ) -> None:
-            self.s1 = s1
-            self.s2 = s2
-
-        class Iter(Iterator[Callable[[Any], bool]]):
-            def __init__(
-                self,
-                i1: Iterator[Callable[[Any], bool]],
-                i2: Iterator[Callable[[Any], bool]],
-            ) -> None:
-                self.i1 = i1
-                self.i2 = i2
-                self.p1 = _next_or_none(self.i1)
-                self.p2 = _next_or_none(self.i2)
-                self.next = self
-
-            def __call__(self, dut: Any) -> bool:
-                p1_pass = self.p1 is None or self.p1(dut)
-                p2_pass = not p1_pass and (self.p2 is None or self.p2(dut))
-
-                if p1_pass:
-                    self.p1 = _next_or_none(self.i1)
-                if p2_pass:
-                    self.p2 = _next_or_none(self.i2)
-
-                if self.p1 is None or self.p2 is None:
-                    self.next = None
-
-                return p1_pass or p2_pass
-
-            def __next__(self) -> Callable[[Any], bool]:
-                if self.next is None:
-                    raise StopIteration()
-                return self.next
-
-            def __str__(self) -> str:
-                return f"({self.p1} | {self.p2})"
-
-        def __iter__(self) -> Iterator:
-            return self.Iter(self.s1.__iter__(), self.s2.__iter__())
+    def decorator(predicate: Predicate) -> Predicate:
+        predicate.gated_on = gates
+        return predicate
+
+    return decorator
+
+
+def _gates(state: tuple, dut: Any) -> Optional[list]:
+    """Handles all predicates of 'state' are gated on, None if any of them isn't gated."""
+    handles = []
+    for predicate in state:
+        if isinstance(predicate, _OrState):
+            if predicate.p1 is None or predicate.p2 is None:
+                return None
+            gates = [_gates(predicate.p1, dut), _gates(predicate.p2, dut)]
+            if None in gates:
+                return None
+            handles += gates[0] + gates[1]
+            continue
+        if isinstance(predicate, functools.partial):
+            predicate = predicate.func
+        gate = getattr(predicate, "gated_on", None)
+        if gate is None:
+            return None
+        handles += gate(dut)
+    return handles
+
+
+class _Or:
+    def __init__(self, s1, s2) -> None:
+        self.s1 = s1
+        self.s2 = s2
+
+
+class _And:
+    def __init__(self, s1, s2) -> None:
+        self.s1 = s1
+        self.s2 = s2
+
+
+class _Concat:
+    def __init__(self, parts) -> None:
+        self.parts = parts
+
+
+class _OrState:
+    """
+    Alternative of two sequences, that advance independently. The first one has priority
+    in each cycle. Completes when either of the sequences does.
+    """
+
+    def __init__(self, s1: Iterator[tuple], s2: Iterator[tuple]) -> None:
+        self.s1 = s1
+        self.s2 = s2
+        self.p1 = next(s1, None)
+        self.p2 = next(s2, None)
+        self.done = False
+
+    def __call__(self, dut: Any) -> bool:
+        p1_pass = self.p1 is None or _eval_state(self.p1, dut)
+        p2_pass = not p1_pass and (self.p2 is None or _eval_state(self.p2, dut))
+
+        if p1_pass:
+            self.p1 = next(self.s1, None)
+        if p2_pass:
+            self.p2 = next(self.s2, None)
+
+        self.done = self.p1 is None or self.p2 is None
+        return p1_pass or p2_pass
+
+    def __str__(self) -> str:
+        return f"({_state_str(self.p1)} | {_state_str(self.p2)})"
 
-    def __or__(self, other: "Sequence") -> "Sequence":
-        return Sequence(self.OrSeqState(self.sequence, other.sequence))
 
-    class AndSeqState(Iterable[Callable[[Any], bool]]):
-        def __init__(
-            self, s1: Iterable[Callable[[Any], bool]], s2: Iterable[Callable[[Any], bool]]
-        ) -> None:
-            self.s = zip(s1, s2)
+def _eval_state(state: tuple, dut: Any) -> bool:
+    for predicate in state:
+        if not predicate(dut):
+            return False
+    return True
 
-        class Iter(Iterator[Callable[[Any], bool]]):
-            def __init__(
-                self, it: Iterator[tuple[Callable[[Any], bool], Callable[[Any], bool]]]
-            ) -> None:
-                self.it = it
-                self.p = _next_or_none(self.it)
-                self.next = self
 
-            def __call__(self, dut: Any) -> bool:
-                p_pass = self.p is None or (self.p[0](dut) and self.p[1](dut))
+def _state_str(state: Optional[tuple]) -> str:
+    if state is None:
+        return str(None)
+    return " & ".join(str(p) for p in state)
 
-                if p_pass:
-                    self.p = _next_or_none(self.it)
 
-                if self.p is None:
-                    self.next = None
+def _compile(node) -> Iterator[tuple]:
+    """
+    Flatten a sequence into states, one per cycle of the match. Each state is a tuple of
+    predicates, that all have to pass in the same cycle. States are pulled lazily, so that
+    sequences can be infinite, e.g. 'Sequence(repeat(predicate)) & other'.
+    """
+    if isinstance(node, _Concat):
+        for part in node.parts:
+            yield from _compile(part)
+    elif isinstance(node, _And):
+        states = (s1 + s2 for s1, s2 in zip(_compile(node.s1), _compile(node.s2)))
+        # An empty conjunction still takes a cycle
+        yield next(states, ())
+        yield from states
+    elif isinstance(node, _Or):
+        state = _OrState(_compile(node.s1), _compile(node.s2))
+        while not state.done:
+            yield (state,)
+    else:
+        for predicate in node:
+            yield (predicate,)
+
+
+class _Sampler:
+    """Counts cycles of a match, values of handles are read at most once per cycle."""
+
+    def __init__(self) -> None:
+        self.cycle = 0
+
+
+class _SampledHandle:
+    """
+    Proxy of a DUT handle passed to predicates, so that all of them see values sampled
+    once in a cycle. Writes and private attributes are forwarded to the handle.
+    """
+
+    def __init__(self, handle: Any, sampler: _Sampler) -> None:
+        self._handle = handle
+        self._sampler = sampler
+        self._cycle = -1
+        self._value = None
 
-                return p_pass
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._handle, name)
+        if name.startswith("_"):
+            return attr
+        # Store the child proxy, so that subsequent lookups don't get here
+        child = _SampledHandle(attr, self._sampler)
+        setattr(self, name, child)
+        return child
+
+    def __getitem__(self, index: int) -> "_SampledHandle":
+        return _SampledHandle(self._handle[index], self._sampler)
+
+    @property
+    def value(self) -> Any:
+        if self._cycle != self._sampler.cycle:
+            self._value = self._handle.value
+            self._cycle = self._sampler.cycle
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._handle.value = value
+
+
+class Sequence:
+    """
+    Sequence of predicates matched against the DUT, one predicate per clock cycle.
+    Sequences are composed with '+' (one after the other), '|' (either of them) and '&'
+    (both at once, as long as the shorter one). A predicate returns True when it matches,
+    False to be evaluated again in the next cycle and raises SequenceFailed on a mismatch.
+    """
 
-            def __next__(self) -> Callable[[Any], bool]:
-                if self.next is None:
-                    raise StopIteration()
-                return self.next
+    def __init__(self, sequence: Union[Iterable[Predicate], Predicate] = []):
+        if isinstance(sequence, (Iterable, _Or, _And, _Concat)):
+            self.sequence = sequence
+        else:
+            self.sequence = [sequence]
 
-            def __str__(self) -> str:
-                if self.p is None:
-                    return str(None)
-                return f"({self.p[0]} & {self.p[1]})"
+    def __add__(self, other: "Sequence") -> "Sequence":
+        parts = [
+            part
+            for s in (self.sequence, other.sequence)
+            for part in (s.parts if isinstance(s, _Concat) else [s])
+        ]
+        return Sequence(_Concat(parts))
 
-        def __iter__(self) -> Iterator:
-            return self.Iter(self.s.__iter__())
+    def __or__(self, other: "Sequence") -> "Sequence":
+        return Sequence(_Or(self.sequence, other.sequence))
 
     def __and__(self, other: "Sequence") -> "Sequence":
-        return Sequence(self.AndSeqState(self.sequence, other.sequence))
+        return Sequence(_And(self.sequence, other.sequence))
 
     async def match(
         self, dut, clk, cycle_cnt: int, noexcept: bool = True, trace: bool = False
     ) -> SequenceMatch:
         match_ = SequenceMatch()
+        edge = RisingEdge(clk)
 
-        it = self.sequence.__iter__()
-        predicate = None
+        states = _compile(self.sequence)
+        state = None
 
-        match_.matched = False
-        match_.cycle = 0
-        new_predicate = False
+        sampler = _Sampler()
+        sampled_dut = _SampledHandle(dut, sampler)
+
+        # Clock period in simulation steps, to count cycles skipped while sleeping
+        period = None
+        last_edge = None
+        # Verilator evaluates the model before RisingEdge callbacks, so gates raised by
+        # a clock edge change in the callback batch of that edge
+        same_batch = "verilator" in (getattr(cocotb, "SIM_NAME", None) or "").lower()
 
         while cycle_cnt == 0 or match_.cycle < cycle_cnt:
-            if predicate is None:
-                try:
-                    predicate = it.__next__()
-                    new_predicate = True
-                except StopIteration:
+            if state is None:
+                state = next(states, None)
+                if state is None:
                     match_.matched = True
                     return match_
+                if trace:
+                    dut._log.info(f"Matching predicate `{_state_str(state)}`")
 
+            gates = None
             try:
-                if new_predicate and trace:
-                    dut._log.info(f"Matching predicate `{predicate}`")
-                if predicate(dut):
-                    predicate = None
+                if _eval_state(state, sampled_dut):
+                    state = None
                     match_.match_count += 1
+                elif period:
+                    gates = _gates(state, dut)
             except SequenceFailed as e:
                 dut._log.error(
-                    f"Sequence {self} failed at cycle {match_.cycle}, predicate {predicate}"
+                    f"Sequence {self} failed at cycle {match_.cycle}, "
+                    f"predicate {_state_str(state)}"
                 )
                 if not noexcept:
                     raise SequenceFailed(e.desc, match_)
                 return match_
             except SequenceRetry:
-                predicate = None
-                it = self.sequence.__iter__()
-
-            new_predicate = False
-            await ClockCycles(clk, 1)
-            match_.cycle += 1
-
-        if not match_ and trace:
+                state = None
+                states = _compile(self.sequence)
+
+            # Sleep while the current predicates are gated off, until the cycle limit
+            remaining = cycle_cnt - match_.cycle - 1 if cycle_cnt else None
+            if gates and remaining != 0 and not any(gate.value for gate in gates):
+                triggers = [Edge(gate) for gate in gates]
+                if remaining:
+                    triggers.append(Timer(remaining * period, "step"))
+                fired = await First(*triggers)
+                now = get_sim_time("step")
+                # A gate raised in the batch of a clock edge is evaluated in that cycle, as
+                # awaiting the edge would skip to the next one. Otherwise predicates see the
+                # gates changed at the next clock edge
+                on_edge = now > last_edge and (now - last_edge) % period == 0
+                if not (same_batch and on_edge and isinstance(fired, Edge)):
+                    await edge
+                    now = get_sim_time("step")
+                match_.cycle += round((now - last_edge) / period)
+            else:
+                await edge
+                now = get_sim_time("step")
+                if last_edge is not None and period is None:
+                    period = now - last_edge
+                match_.cycle += 1
+            last_edge = now
+            sampler.cycle = match_.cycle
+
+        if not match_.matched and trace:
             dut._log.warning("Sequence timed out")
 
         return match_
 
 
 def split_into_dwords(data: bytes) -> Iterable[tuple[int, int]]:
-    def or_null(d, idx):
-        return d[idx] if idx < len(d) else 0
-
-    byte_idx = 0
-    data_len = len(data)
-    dword = 0
-    while byte_idx < data_len:
-        dword = (
-            (or_null(data, byte_idx + 3) << 24)
-            | (or_null(data, byte_idx + 2) << 16)
-            | (or_null(data, byte_idx + 1) << 8)
-            | (or_null(data, byte_idx + 0) << 0)
-        )
-        mask = (1 << min(data_len - byte_idx, 4) * 8) - 1
-
-        yield dword, mask
-
-        byte_idx += 4
+    return bytes2masked_dwords(data)
 
 
 def format_ibi_data(mdb, data):
@@ -336,21 +433,8 @@ def format_ibi_data(mdb, data):
     Given MDB and a list of data bytes (can be empty) prepare a sequence of
     32-bit words to be written to the TTI IBI queue.
     """
-    count = (len(data) + 3) // 4
-    words = [0 for i in range(count)]
-
-    i = 0
-    j = 0
-    for d in data:
-        words[j] |= d << (8 * i)
-
-        i = i + 1
-        if i == 4:
-            i = 0
-            j = j + 1
-
     descr = (mdb << 24) | len(data)
-    return [descr] + words
+    return [descr] + bytes2dwords(data)
 
 
 async def get_interrupt_status(tb):
@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Simulation watchdog. Fails the test when it exceeds its budget of simulation time or wall
+clock time. Tracks the phases the test goes through (e.g. setup, traffic), so that the
+report names the phase that overran & the sim/wall time spent in each phase.
+WATCHDOG_WALL_LIMIT (in seconds) sets the default wall clock limit of a test, so that hung
+tests are stopped early.
+"""
+
+import os
+import time
+from typing import List, Optional
+
+import cocotb
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_steps, get_sim_time, get_time_from_sim_steps
+
+
+class WatchdogTimeout(TimeoutError):
+    pass
+
+
+class _Phase:
+    def __init__(self, name: str):
+        self.name = name
+        self.sim_start = get_sim_time("step")
+        self.wall_start = time.perf_counter()
+        self.sim_end = None
+        self.wall_end = None
+
+    def end(self):
+        self.sim_end = get_sim_time("step")
+        self.wall_end = time.perf_counter()
+
+    @property
+    def sim_time(self) -> int:
+        """Simulation steps spent in the phase."""
+        return (get_sim_time("step") if self.sim_end is None else self.sim_end) - self.sim_start
+
+    @property
+    def wall_time(self) -> float:
+        """Wall clock seconds spent in the phase."""
+        return (time.perf_counter() if self.wall_end is None else self.wall_end) - self.wall_start
+
+
+class Watchdog:
+    """
+    Watchdog of a test. 'total' limits simulation time of the whole test (in 'units') and
+    'wall_limit' its wall clock time (in seconds). Wall clock time is checked every 'poll' of
+    simulation time, so a simulation stuck without advancing its time (e.g. in a zero-time
+    loop) isn't stopped by the watchdog.
+    """
+
+    def __init__(
+        self,
+        total: Optional[float] = None,
+        units: str = "us",
+        wall_limit: Optional[float] = None,
+        poll: float = 1,
+    ):
+        if wall_limit is None and os.getenv("WATCHDOG_WALL_LIMIT"):
+            wall_limit = float(os.getenv("WATCHDOG_WALL_LIMIT"))
+
+        self.units = units
+        self.total = None if total is None else get_sim_steps(total, units)
+        self.wall_limit = wall_limit
+        self.poll = get_sim_steps(poll, units)
+        self.phases: List[_Phase] = []
+        self._task = None
+
+    def start(self, phase: str = "setup") -> "Watchdog":
+        """Start watching the test, beginning with 'phase'."""
+        self.phases = [_Phase(phase)]
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def phase(self, name: str) -> None:
+        """End the current phase & start watching the next one."""
+        self.phases[-1].end()
+        self.phases.append(_Phase(name))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+        if self.phases and self.phases[-1].sim_end is None:
+            self.phases[-1].end()
+
+    def _time(self, steps: int) -> str:
+        return f"{get_time_from_sim_steps(steps, self.units):g} {self.units}"
+
+    def report(self) -> str:
+        """Simulation & wall clock time spent in each phase."""
+        return ", ".join(
+            f"{p.name}: {self._time(p.sim_time)} ({p.wall_time:.2f} s wall)" for p in self.phases
+        )
+
+    def _overrun(self) -> Optional[str]:
+        """Describe the exceeded budget, if any."""
+        phase = self.phases[-1]
+        sim_time = get_sim_time("step") - self.phases[0].sim_start
+        wall_time = time.perf_counter() - self.phases[0].wall_start
+
+        if self.total is not None and sim_time >= self.total:
+            return f"Test overran its budget of {self._time(self.total)} in phase '{phase.name}'"
+        if self.wall_limit is not None and wall_time >= self.wall_limit:
+            return (
+                f"Test overran its wall clock limit of {self.wall_limit} s "
+                f"in phase '{phase.name}'"
+            )
+        return None
+
+    def _sleep(self) -> Optional[int]:
+        """Simulation steps until a limit may be exceeded, None if there is no limit."""
+        deadlines = []
+        if self.total is not None:
+            deadlines.append(self.total - (get_sim_time("step") - self.phases[0].sim_start))
+        if self.wall_limit is not None:
+            deadlines.append(self.poll)
+        return max(min(deadlines), 1) if deadlines else None
+
+    async def _run(self):
+        while True:
+            sleep = self._sleep()
+            if sleep is None:
+                return
+            await Timer(sleep, "step")
+
+            overrun = self._overrun()
+            if overrun is not None:
+                self.phases[-1].end()
+                raise WatchdogTimeout(f"{overrun}, time spent: {self.report()}")
@@ -1,15 +1,37 @@
 # SPDX-License-Identifier: Apache-2.0
+import argparse
+import dataclasses
 import functools
+import itertools
 import os
 import random
 import time
-import shutil
 
 from dataclasses import dataclass, field
 from typing import List
 
 import nox
-from nox_utils import VerificationTest, isCocotbSimFailure, nox_config, sim_repeater_path
+from nox_utils import (
+    CoverageMerge,
+    DurationDB,
+    Job,
+    JobScheduler,
+    ModelCache,
+    ResultsReport,
+    VerificationTest,
+    get_cfg_name,
+    get_random_seed,
+    get_test_duration,
+    isCocotbSimFailure,
+    load_durations,
+    nox_config,
+    parse_results,
+    parse_shard,
+    run_logged,
+    save_durations,
+    shard_jobs,
+    sim_repeater_path,
+)
 
 # Common nox configuration
 nox = nox_config(nox)
@@ -37,6 +59,36 @@ test_iterations = int(os.getenv("TEST_ITERATIONS", 1))
 # AXI & Target tests
 target_support = os.getenv("TARGET_SUPPORT", True)
 controller_support = os.getenv("CONTROLLER_SUPPORT", False)
+# Number of tests run concurrently by the `regression` session
+# and by the sessions running whole test groups
+jobs = int(os.getenv("NOX_JOBS", os.cpu_count() or 1))
+# Stop running tests after this many failures, 0 runs all tests regardless of failures
+max_failures = int(os.getenv("NOX_MAX_FAILURES", 0))
+# Run all test modules of a session within a single nox session, building the toplevel once
+group_tests = os.getenv("NOX_GROUP_TESTS", "0") == "1"
+# Cache of compiled simulation models shared by all tests, set to empty string to disable
+model_cache_dir = os.getenv(
+    "MODEL_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "sim_model_cache")
+)
+model_cache = ModelCache(model_cache_dir) if model_cache_dir else None
+# Merged coverage of the `regression` session, along with cached partial merges
+coverage_dir = os.getenv(
+    "COVERAGE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "coverage")
+)
+# Database of test durations kept next to status.json, set to empty string to disable
+duration_db_path = os.getenv("NOX_DURATIONS_DB", "test_timings.json")
+duration_db = DurationDB(duration_db_path) if duration_db_path else None
+# Test cases which ran notably slower than in the previous run
+timing_regressions = []
+# Merged JUnit report of all tests, disabled unless a path is given
+results_report_path = os.getenv("NOX_RESULTS_REPORT", "")
+results_report = ResultsReport(results_report_path) if results_report_path else None
+
+# Run tests without dumping waveforms, rerun only failing test cases with waveforms enabled
+waves_on_failure = os.getenv("WAVES_ON_FAILURE", "0") == "1"
+
+# Test sessions known to the `regression` session, filled by the `test` decorator
+registered_tests = []
 
 
 @dataclass
@@ -67,8 +119,14 @@ def test(params: TestParams):
         elif controller_support and "controller" not in params.tags:
             return
 
+        registered_tests.append((func, params))
+
+        session_params = params
+        if group_tests and len(params.test_name) > 1:
+            session_params = dataclasses.replace(params, test_name=[",".join(params.test_name)])
+
         # Apply parametrize decorators
-        for k, v in reversed(params.__dict__.items()):
+        for k, v in reversed(session_params.__dict__.items()):
             if k != "tags":
                 func = nox.parametrize(k, v)(func)
 
@@ -83,79 +141,286 @@ def test(params: TestParams):
     return wrapper
 
 
-def _verify(session, test_group, test_type, test_name, coverage=None, simulator=None):
-    # session.install("-r", pip_requirements_path)
-    for i in range(test_iterations):
-        pfx = "" if test_iterations == 1 else f"_{i}"
-        test = VerificationTest(test_group, test_type, test_name, coverage, pfx)
-        # Translate session options to plusargs
-        plusargs = list(session.posargs)
-
-        # Randomize seed for initialization of undefined signals in the simulation
-        random.seed(time.time_ns())
-        seed = random.randint(1, 10000)
-
-        with open(test.paths["log_default"], "w") as test_log:
-            # Remove simulation build artifacts
-            # When collecting coverage and renaming `vdb` database
-            # the following simulations will fail due to non-existent database
-            if simulator == "vcs" and i > 0:
-                shutil.rmtree(os.path.join(test.testPath, test.sim_build))
-
-            filelist = None
-
-            if target_support:
-                plusargs.extend(["+TargetSupport"])
-                filelist = f"{i3c_root}/src/i3c_target.f"
-
-            if controller_support:
-                plusargs.extend(["+ControllerSupport"])
-                filelist = f"{i3c_root}/src/i3c_controller.f"
-
-            if controller_support and target_support:
-                filelist = f"{i3c_root}/src/i3c.f"
-
-            args = [
-                sim_repeater_path(),
-                "make",
-                "-C",
-                test.testPath,
-                "all",
-                "MODULE=" + test_name,
-                "COCOTB_RESULTS_FILE=" + test.filenames["xml"],
-                "FILELIST=" + filelist,
-                "NOX_SESSION=1",
+class JobCollector:
+    """
+    Stand-in for `nox.Session` used by the `regression` session.
+    Instead of running the tests, `_verify` records them to be scheduled later.
+    """
+
+    def __init__(self, posargs):
+        self.posargs = posargs
+        self.tests = []
+
+
+def _make_args(posargs, test, test_name, coverage, simulator, seed, waves=False):
+    """
+    Make variables configuring the test described by `test`
+    """
+    # Translate session options to plusargs
+    plusargs = list(posargs)
+
+    filelist = None
+
+    if target_support:
+        plusargs.extend(["+TargetSupport"])
+        filelist = f"{i3c_root}/src/i3c_target.f"
+
+    if controller_support:
+        plusargs.extend(["+ControllerSupport"])
+        filelist = f"{i3c_root}/src/i3c_controller.f"
+
+    if controller_support and target_support:
+        filelist = f"{i3c_root}/src/i3c.f"
+
+    args = [
+        "MODULE=" + test_name,
+        *test.make_args(),
+        "FILELIST=" + filelist,
+        "NOX_SESSION=1",
+    ]
+
+    if simulator == "verilator":
+        plusargs.extend(
+            [
+                "+verilator+rand+reset+2",
+                f"+verilator+seed+{seed}",
             ]
+        )
+    if coverage:
+        args.append("COVERAGE_TYPE=" + coverage)
 
-            if simulator == "verilator":
-                plusargs.extend(
-                    [
-                        "+verilator+rand+reset+2",
-                        f"+verilator+seed+{seed}",
-                    ]
-                )
-            if coverage:
-                args.append("COVERAGE_TYPE=" + coverage)
+    if simulator:
+        args.append("SIM=" + simulator)
 
-            if simulator:
-                args.append("SIM=" + simulator)
+    if waves_on_failure:
+        args.append("WAVES=" + ("1" if waves else "0"))
+
+    args.append("PLUSARGS=" + " ".join(plusargs))
+
+    return args
+
+
+def _use_model_cache(coverage, simulator):
+    # VCS stores coverage database next to the model, it can't be shared between tests
+    return model_cache is not None and not (coverage and simulator == "vcs")
+
+
+def _generate_config(run, test, coverage, simulator):
+    """
+    Generate the I3C configuration of the test directory and, for VCS with coverage,
+    its coverage configuration (cm.cfg) up front, so that tests run concurrently
+    in the directory don't regenerate the files while the others use them
+    """
+    stamp = test.config_stamp()
+    cm_file = os.path.join(os.path.dirname(stamp), "cm.cfg")
+    for path in [stamp, cm_file]:
+        if os.path.exists(path):
+            os.remove(path)
+    args = ["SIM=" + simulator]
+    if coverage:
+        args.append("COVERAGE_TYPE=" + coverage)
+    run(["make", "-C", test.testPath, stamp, *args])
+
+
+def _random_seeds(count):
+    # Randomize seeds for initialization of undefined signals in the simulation,
+    # runs of the same test have to be given distinct seeds
+    random.seed(time.time_ns())
+    return random.sample(range(1, 10001), count)
+
+
+def _iteration_pfx(i):
+    return "" if test_iterations == 1 else f"_{i}"
+
+
+def _build_test(run, posargs, test, test_name, coverage, simulator, seed, waves=False):
+    """
+    Build simulation model of the test described by `test`, reusing the model
+    from the model cache when possible.
+    Returns make variables running the test with the built model.
+    """
+    make = [sim_repeater_path(), "make", "-C", test.testPath]
+    args = _make_args(posargs, test, test_name, coverage, simulator, seed, waves)
+
+    if not _use_model_cache(coverage, simulator):
+        run([*make, "build", *args])
+        test.use_model(os.path.abspath(os.path.join(test.testPath, test.sim_build)))
+        return _make_args(posargs, test, test_name, coverage, simulator, seed, waves)
+
+    # Sources have to be generated for the configuration before they are hashed
+    run([*make, test.config_stamp(), *args])
+    key = model_cache.key(test.testPath, args)
+    test.use_model(model_cache.model_dir(key))
+    args = _make_args(posargs, test, test_name, coverage, simulator, seed, waves)
+
+    with model_cache.lock(key):
+        if not model_cache.is_built(key):
+            run([*make, "build", *args])
+            model_cache.mark_built(key)
+
+    return args
+
+
+def _run_test(run, posargs, test, test_name, coverage, simulator, seed):
+    """
+    Build and run the test described by `test`.
+    `run` executes given command with its output redirected to the test log.
+    """
+    make = [sim_repeater_path(), "make", "-C", test.testPath]
+
+    if not _use_model_cache(coverage, simulator):
+        run([*make, "all", *_make_args(posargs, test, test_name, coverage, simulator, seed)])
+        return
+
+    args = _build_test(run, posargs, test, test_name, coverage, simulator, seed)
+    run([*make, "run", *args])
+
+
+def _run_prebuilt(posargs, test, coverage, simulator, seed):
+    """
+    Run the test with a model built beforehand by `_build_test`
+    """
+    with open(test.paths["log_default"], "w") as test_log:
+        args = _make_args(posargs, test, test.testName, coverage, simulator, seed)
+        run_logged([sim_repeater_path(), "make", "-C", test.testPath, "run", *args], test_log)
+    _check_test(test, coverage, simulator, posargs, seed)
+
+
+def _rerun_with_waves(posargs, test, simulator, seed, testcases):
+    """
+    Rerun `testcases` of the test with the same seeds and waveform dumping enabled.
+    The waveforms are placed in `test.paths["vcd"]`, results and log of the rerun are
+    stored next to the ones of the original run with `_waves` suffix.
+    """
+    # Coverage isn't collected, so that data of the original run isn't overwritten
+    coverage = None
+    name = f"{test.testName}{test.pfx}_waves"
+    make = [sim_repeater_path(), "make", "-C", test.testPath]
+    rerun_args = ["TESTCASE=" + ",".join(testcases), f"COCOTB_RESULTS_FILE={name}.xml"]
+    # Stimulus drawn from Python's random module has to be the same as in the original run
+    random_seed = get_random_seed(test.paths["xml"])
+    if random_seed is not None:
+        rerun_args.append(f"RANDOM_SEED={random_seed}")
+
+    with open(os.path.join(test.testPath, f"{name}.log"), "w") as log:
+        run = functools.partial(run_logged, log=log)
+        if _use_model_cache(coverage, simulator):
+            args = _build_test(run, posargs, test, test.testName, coverage, simulator, seed, True)
+            run([*make, "run", *args, *rerun_args])
+        else:
+            # Model with tracing enabled can't replace the one in the test build directory
+            args = _make_args(posargs, test, test.testName, coverage, simulator, seed, True)
+            sim_build = os.path.abspath(os.path.join(test.testPath, test.sim_build)) + "-waves"
+            run([*make, "all", *args, "SIM_BUILD=" + sim_build, *rerun_args])
+    test.rename_default("vcd")
+
+
+def _check_test(test, coverage, simulator, posargs=None, seed=None):
+    # Prevent coverage.dat and test log from being overwritten
+    test.rename_defaults(coverage, simulator, vcd=not waves_on_failure)
+
+    if results_report is not None:
+        results_report.add(test.name, test.paths["xml"])
+
+    # Add check from results.xml to notify nox that test failed
+    if isCocotbSimFailure(resultsFile=test.paths["xml"]):
+        if waves_on_failure and seed is not None:
+            testcases = parse_results(test.paths["xml"])
+            last = max(i for i, tc in enumerate(testcases) if tc.failure is not None)
+            # cocotb seeds the random module once per run, test cases preceding the failing
+            # ones are run again so that the failing ones draw the same stimulus
+            rerun = [tc.name for tc in testcases[: last + 1]]
+            print(f"Rerunning {', '.join(rerun)} with waveforms enabled")
+            _rerun_with_waves(posargs, test, simulator, seed, rerun)
+        raise Exception("SimFailure: cocotb failed. See test logs for more information.")
+
+    if duration_db is not None:
+        regressions = duration_db.record(test.name, test.paths["xml"])
+        for message in regressions:
+            print(f"Timing regression: {message}")
+        timing_regressions.extend(regressions)
 
-            args.append("PLUSARGS=" + " ".join(plusargs))
 
-            print(args)
+def _verify(session, test_group, test_type, test_name, coverage=None, simulator=None):
+    if isinstance(session, JobCollector):
+        session.tests.append((test_group, test_type, test_name, coverage, simulator))
+        return
+
+    test_names = test_name.split(",")
+    if len(test_names) > 1 or test_iterations > 1:
+        _verify_group(session, test_group, test_type, test_names, coverage, simulator)
+        return
+
+    # session.install("-r", pip_requirements_path)
+    test = VerificationTest(test_group, test_type, test_name, coverage)
+
+    with open(test.paths["log_default"], "w") as test_log:
 
+        def run(args):
+            print(args)
             session.run(
                 *args,
                 external=True,
                 stdout=test_log,
                 stderr=test_log,
             )
-        # Prevent coverage.dat and test log from being overwritten
-        test.rename_defaults(coverage, simulator)
 
-        # Add check from results.xml to notify nox that test failed
-        if isCocotbSimFailure(resultsFile=test.paths["xml"]):
-            raise Exception("SimFailure: cocotb failed. See test logs for more information.")
+        seed = _random_seeds(1)[0]
+        _run_test(run, session.posargs, test, test_name, coverage, simulator, seed)
+
+    _check_test(test, coverage, simulator, session.posargs, seed)
+
+
+def _verify_group(session, test_group, test_type, test_names, coverage, simulator):
+    """
+    Build the toplevel of the test group once and run all its test modules and their iterations
+    against the built model concurrently. Each run gets its own seed and output files,
+    as separate tests would. Configuration shared by the runs is generated before any
+    of them starts.
+    """
+    tests = [
+        VerificationTest(
+            test_group, test_type, test_name, coverage, _iteration_pfx(i), isolated=True
+        )
+        for test_name in test_names
+        for i in range(test_iterations)
+    ]
+    seeds = _random_seeds(len(tests))
+    _generate_config(
+        lambda args: session.run(*args, external=True, silent=True), tests[0], coverage, simulator
+    )
+
+    if coverage and simulator == "vcs":
+        # Coverage database is stored with the model, each run needs its own build
+        runners = [
+            functools.partial(
+                _run_isolated, session.posargs, test, test.testName, coverage, simulator, seed
+            )
+            for test, seed in zip(tests, seeds)
+        ]
+    else:
+        first = tests[0]
+        build_log = os.path.join(first.testPath, f"build_{test_group}.log")
+        with open(build_log, "w") as log:
+            session.log(f"Building {test_group} model, see {build_log}")
+            run = functools.partial(run_logged, log=log)
+            _build_test(run, session.posargs, first, first.testName, coverage, simulator, seeds[0])
+        for test in tests[1:]:
+            test.use_model(first.sim_build)
+        runners = [
+            functools.partial(_run_prebuilt, session.posargs, test, coverage, simulator, seed)
+            for test, seed in zip(tests, seeds)
+        ]
+
+    scheduler = JobScheduler(jobs, log=session.log, max_failures=max_failures)
+    results = scheduler.run(
+        [Job(f"{test_group}/{test.testName}{test.pfx}", func) for test, func in zip(tests, runners)]
+    )
+    failed = [r.name for r in results if not r.passed]
+    if failed:
+        raise Exception(
+            f"SimFailure: {', '.join(failed)} failed. See test logs for more information."
+        )
 
 
 def verify_block(session, test_group, test_name, coverage=None, simulator=None):
@@ -177,6 +442,17 @@ def ahb_if_verify(session, test_group, test_name, coverage, simulator):
     verify_block(session, test_group, test_name, coverage, simulator)
 
 
+@test(
+    TestParams(
+        ["bench", "target", "controller"],
+        ["ahb_if"],
+        ["test_csr_bench"],
+    )
+)
+def ahb_if_bench(session, test_group, test_name, coverage, simulator):
+    verify_block(session, test_group, test_name, coverage, simulator)
+
+
 @test(
     TestParams(
         ["tests", "axi", "target", "controller"],
@@ -191,6 +467,20 @@ def axi_adapter_verify(session, test_group, test_name, coverage, simulator):
     verify_block(session, test_group, test_name, coverage, simulator)
 
 
+@test(
+    TestParams(
+        ["bench", "target", "controller"],
+        ["axi_adapter"],
+        [
+            "test_axi_driver_bench",
+            "test_csr_bench",
+        ],
+    )
+)
+def axi_adapter_bench(session, test_group, test_name, coverage, simulator):
+    verify_block(session, test_group, test_name, coverage, simulator)
+
+
 @test(
     TestParams(
         ["tests", "axi", "target", "controller"],
@@ -368,6 +658,17 @@ def i3c_ahb_verify(session, test_group, test_name, coverage, simulator):
     verify_top(session, test_group, test_name, coverage, simulator)
 
 
+@test(
+    TestParams(
+        ["bench", "target"],
+        ["i3c_ahb"],
+        ["test_csr_bench"],
+    )
+)
+def i3c_ahb_bench(session, test_group, test_name, coverage, simulator):
+    verify_top(session, test_group, test_name, coverage, simulator)
+
+
 @test(
     TestParams(
         ["tests", "ahb", "target"],
@@ -408,6 +709,17 @@ def i3c_axi_verify(session, test_group, test_name, coverage, simulator):
     verify_top(session, test_group, test_name, coverage, simulator)
 
 
+@test(
+    TestParams(
+        ["bench", "target"],
+        ["i3c_axi"],
+        ["test_csr_bench"],
+    )
+)
+def i3c_axi_bench(session, test_group, test_name, coverage, simulator):
+    verify_top(session, test_group, test_name, coverage, simulator)
+
+
 @test(
     TestParams(
         ["tests", "axi", "target"],
@@ -513,6 +825,207 @@ def ctrl_descriptor_rx_verify(session, test_group, test_name, coverage, simulato
     verify_block(session, test_group, test_name, coverage, simulator)
 
 
+def _run_with_coverage(func, merge, name, coverage_db):
+    """
+    Run the test and pass its coverage database to the coverage merge
+    """
+    try:
+        func()
+    except BaseException:
+        # Coverage of failing tests isn't merged
+        merge.add(name, None)
+        raise
+    merge.add(name, coverage_db)
+
+
+def _run_isolated(posargs, test, test_name, coverage, simulator, seed):
+    with open(test.paths["log_default"], "w") as test_log:
+        run = functools.partial(run_logged, log=test_log)
+        _run_test(run, posargs, test, test_name, coverage, simulator, seed)
+    _check_test(test, coverage, simulator, posargs, seed)
+
+
+def _merge_coverage(session, jobs, scheduled_tests, max_jobs):
+    """
+    Set up merging of coverage of the `jobs` in the background, as they finish.
+    Returns merges for each coverage type and simulator.
+    """
+    coverage_jobs = {}
+    for job in jobs:
+        test, simulator = scheduled_tests[job.name]
+        if test.coverage:
+            coverage_jobs.setdefault((test.coverage, simulator), []).append(job)
+
+    coverage_merges = {}
+    for (coverage, simulator), cov_jobs in coverage_jobs.items():
+        merge = CoverageMerge(
+            [job.name for job in cov_jobs],
+            os.path.join(coverage_dir, "cache"),
+            simulator,
+            max_jobs,
+            session.log,
+        )
+        coverage_merges[(coverage, simulator)] = merge
+        for job in cov_jobs:
+            test, _ = scheduled_tests[job.name]
+            coverage_db = test.paths["vdb" if simulator == "vcs" else "cov"]
+            job.func = functools.partial(_run_with_coverage, job.func, merge, job.name, coverage_db)
+    return coverage_merges
+
+
+def _report_coverage(session, coverage_merges):
+    """
+    Wait for the coverage merges and generate reports of the merged coverage
+    """
+    for (coverage, _), merge in coverage_merges.items():
+        database = merge.finish()
+        if merge.errors:
+            session.warn(
+                f"{len(merge.errors)} {coverage} coverage merges failed, coverage is partial"
+            )
+        if database is None:
+            continue
+        merged = os.path.join(coverage_dir, f"merged_{coverage}{merge.suffix}")
+        if os.path.lexists(merged):
+            os.remove(merged)
+        os.symlink(database, merged)
+        session.log(f"Merged {coverage} coverage: {merged}")
+        try:
+            merge.report(database, os.path.join(coverage_dir, f"report_{coverage}"))
+        except Exception as e:
+            # Failures of the tests are reported regardless of the coverage
+            session.warn(f"Coverage report of {merged} failed: {e}")
+
+
+@nox.session()
+def regression(session: nox.Session) -> None:
+    """
+    Run tests from the test sessions concurrently.
+
+    Usage: nox -s regression -- [-j JOBS] [-t TAG [TAG ...]] [--shard K/N]
+                                [--durations FILE] [--longest-first]
+                                [-x | --max-failures N] [PLUSARGS ...]
+
+    Tests are selected by tags in the same way as with `nox -t`. The number of concurrent
+    jobs defaults to the `NOX_JOBS` environment variable or to the number of CPUs.
+
+    `--shard K/N` runs only the K-th of N parts of the selected tests, e.g. to split
+    the regression across N machines. Parts are balanced using test durations from
+    the `--durations` file or, if not given, from the local database of durations.
+    The durations file is updated with the durations of the tests that have been run.
+
+    `--longest-first` starts the longest tests first, so that a long test started
+    late doesn't extend the regression. Tests with unknown duration are started first.
+    Test cases which ran notably slower than in the previous run are reported.
+
+    `-x` stops the regression after the first failing test and `--max-failures N`
+    after N failing tests (`NOX_MAX_FAILURES` by default): tests which haven't started
+    are skipped and running simulations are terminated.
+    """
+    parser = argparse.ArgumentParser(prog="regression")
+    parser.add_argument("-j", "--jobs", type=int, default=jobs)
+    parser.add_argument("-t", "--tags", nargs="+", default=["tests"])
+    parser.add_argument("--shard", type=parse_shard, default=None)
+    parser.add_argument("--durations", default=None)
+    parser.add_argument("--longest-first", action="store_true")
+    parser.add_argument("-x", "--fail-fast", action="store_const", const=1, dest="max_failures")
+    parser.add_argument("--max-failures", type=int, default=max_failures)
+    opts, posargs = parser.parse_known_args(session.posargs)
+    # Plusargs following the tags are consumed by the parser
+    tags = [t for t in opts.tags if not t.startswith("+")]
+    posargs += [t for t in opts.tags if t.startswith("+")]
+
+    # Collect tests from the selected sessions
+    collector = JobCollector(posargs)
+    for func, params in registered_tests:
+        if not set(tags) & set(params.tags):
+            continue
+        for test_group, test_name, coverage, simulator in itertools.product(
+            params.test_group, params.test_name, params.coverage or [None], params.simulator
+        ):
+            func(collector, test_group, test_name, coverage, simulator)
+
+    scheduled = {}
+    scheduled_tests = {}
+    for test_group, test_type, test_name, coverage, simulator in collector.tests:
+        seeds = _random_seeds(test_iterations)
+        for i in range(test_iterations):
+            pfx = _iteration_pfx(i)
+            test = VerificationTest(test_group, test_type, test_name, coverage, pfx, isolated=True)
+            name = test.name
+            if name in scheduled:
+                continue
+
+            scheduled_tests[name] = (test, simulator)
+            scheduled[name] = Job(
+                name,
+                functools.partial(
+                    _run_isolated, posargs, test, test_name, coverage, simulator, seeds[i]
+                ),
+                get_cfg_name(test.testPath),
+            )
+
+    if opts.durations:
+        durations = load_durations(opts.durations)
+    elif duration_db is not None:
+        durations = duration_db.durations()
+    else:
+        durations = {}
+
+    selected = list(scheduled.values())
+    if opts.shard:
+        selected = shard_jobs(selected, durations, *opts.shard)
+        session.log(f"Shard {opts.shard[0]}/{opts.shard[1]}: {len(selected)} tests selected")
+    if opts.longest_first:
+        # Jobs are grouped by phases by the scheduler, the sort only orders jobs within a phase
+        selected.sort(key=lambda job: -durations.get(job.name, float("inf")))
+
+    coverage_merges = _merge_coverage(session, selected, scheduled_tests, opts.jobs)
+
+    phase_tests = {}
+    for job in selected:
+        test, simulator = scheduled_tests[job.name]
+        phase_tests.setdefault(job.phase, {})[test.testPath] = (test, simulator)
+
+    def prepare(phase, phase_jobs):
+        # Generate configuration up front, so that concurrently built tests (including
+        # iterations of the same test) don't regenerate files used by each other
+        session.log(f"Running {len(phase_jobs)} tests with '{phase}' I3C configuration")
+        for test, simulator in phase_tests[phase].values():
+            _generate_config(
+                lambda args: session.run(*args, external=True, silent=True),
+                test,
+                test.coverage,
+                simulator,
+            )
+
+    scheduler = JobScheduler(opts.jobs, prepare, session.log, opts.max_failures)
+    results = scheduler.run(selected)
+
+    if opts.durations:
+        for result in results:
+            if result.cancelled:
+                continue
+            test, _ = scheduled_tests[result.name]
+            duration = get_test_duration(test.paths["xml"])
+            if duration is not None:
+                durations[result.name] = duration
+        save_durations(opts.durations, durations)
+
+    _report_coverage(session, coverage_merges)
+
+    for message in timing_regressions:
+        session.warn(f"Timing regression: {message}")
+
+    cancelled = [r.name for r in results if r.cancelled]
+    if cancelled:
+        session.warn(f"{len(cancelled)} tests cancelled: {', '.join(cancelled)}")
+
+    failed = [r.name for r in results if not r.passed and not r.cancelled]
+    if failed:
+        session.error(f"{len(failed)} of {len(results)} tests failed: {', '.join(failed)}")
+
+
 @nox.session(reuse_venv=True)
 def lint(session: nox.Session) -> None:
     """Options are defined in pyproject.toml and .flake8 files"""
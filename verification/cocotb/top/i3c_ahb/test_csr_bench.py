@@ -0,0 +1 @@
+../lib_i3c_top/test_csr_bench.py
\ No newline at end of file
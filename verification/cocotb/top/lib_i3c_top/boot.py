@@ -79,17 +79,19 @@ async def boot_init(
             "T_SU_DAT": 0,
         }
 
-    await _write_csr(tb, tb.reg_map.I3C_EC.SOCMGMTIF.T_R_REG.base_addr, timings["T_R"])
-    await _write_csr(tb, tb.reg_map.I3C_EC.SOCMGMTIF.T_F_REG.base_addr, timings["T_F"])
-    await _write_csr(tb, tb.reg_map.I3C_EC.SOCMGMTIF.T_HD_DAT_REG.base_addr, timings["T_HD_DAT"])
-    await _write_csr(tb, tb.reg_map.I3C_EC.SOCMGMTIF.T_SU_DAT_REG.base_addr, timings["T_SU_DAT"])
-
-    await setup_hci_thresholds(tb)
-
-    # Start the device
-    await umbrella_stby_init(
-        tb, verify, static_addr, virtual_static_addr, dynamic_addr, virtual_dynamic_addr
-    )
+    with tb.backdoor_access(tb.setup_backdoor):
+        regs = tb.reg_map.I3C_EC.SOCMGMTIF
+        await _write_csr(tb, regs.T_R_REG.base_addr, timings["T_R"])
+        await _write_csr(tb, regs.T_F_REG.base_addr, timings["T_F"])
+        await _write_csr(tb, regs.T_HD_DAT_REG.base_addr, timings["T_HD_DAT"])
+        await _write_csr(tb, regs.T_SU_DAT_REG.base_addr, timings["T_SU_DAT"])
+
+        await setup_hci_thresholds(tb)
+
+        # Start the device
+        await umbrella_stby_init(
+            tb, verify, static_addr, virtual_static_addr, dynamic_addr, virtual_dynamic_addr
+        )
 
 
 async def check_version(tb):
@@ -225,67 +227,61 @@ async def umbrella_stby_init(
     TODO: Current implementation is a stub. Expand.
     """
 
-    # Boot in standby mode
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.STBY_CR_ENABLE_INIT,
-        2,
-    )
-
-    # Set static address and valid
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.STATIC_ADDR,
-        static_addr,
-    )
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.STATIC_ADDR_VALID,
-        0x1,
-    )
-
-    # Set static address and valid for virtual device
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR,
-        virtual_static_addr,
-    )
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR_VALID,
-        0x1,
-    )
+    regs = tb.reg_map.I3C_EC.STDBYCTRLMODE
+    program = [
+        # Boot in standby mode
+        (regs.STBY_CR_CONTROL.base_addr, regs.STBY_CR_CONTROL.STBY_CR_ENABLE_INIT, 2),
+        # Set static address and valid
+        (regs.STBY_CR_DEVICE_ADDR.base_addr, regs.STBY_CR_DEVICE_ADDR.STATIC_ADDR, static_addr),
+        (regs.STBY_CR_DEVICE_ADDR.base_addr, regs.STBY_CR_DEVICE_ADDR.STATIC_ADDR_VALID, 1),
+        # Set static address and valid for virtual device
+        (
+            regs.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
+            regs.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR,
+            virtual_static_addr,
+        ),
+        (
+            regs.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
+            regs.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR_VALID,
+            1,
+        ),
+    ]
     # Set dynamic address and valid
     if dynamic_addr is not None:
-        await tb.write_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.DYNAMIC_ADDR,
-            dynamic_addr
-        )
-        await tb.write_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.DYNAMIC_ADDR_VALID,
-            1
-        )
+        program += [
+            (
+                regs.STBY_CR_DEVICE_ADDR.base_addr,
+                regs.STBY_CR_DEVICE_ADDR.DYNAMIC_ADDR,
+                dynamic_addr,
+            ),
+            (regs.STBY_CR_DEVICE_ADDR.base_addr, regs.STBY_CR_DEVICE_ADDR.DYNAMIC_ADDR_VALID, 1),
+        ]
     # Set dynamic address and valid for virtual device
     if virtual_dynamic_addr is not None:
-        await tb.write_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_DYNAMIC_ADDR,
-            virtual_dynamic_addr
-        )
-        await tb.write_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_DYNAMIC_ADDR_VALID,
-            1
-        )
+        program += [
+            (
+                regs.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
+                regs.STBY_CR_VIRT_DEVICE_ADDR.VIRT_DYNAMIC_ADDR,
+                virtual_dynamic_addr,
+            ),
+            (
+                regs.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
+                regs.STBY_CR_VIRT_DEVICE_ADDR.VIRT_DYNAMIC_ADDR_VALID,
+                1,
+            ),
+        ]
+
+    # The target is enabled by the last write, hardware doesn't modify the CSRs before,
+    # so read-modify-writes can rely on the values written. Check if CSRs have been set
+    # properly when verifying
+    with tb.csr_cache(trust_hw_writable=True):
+        await tb.apply_csr_program(program, verify=verify)
 
-    # Enable Target Interface
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.base_addr,
-        tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.TARGET_XACT_ENABLE,
-        1,
-    )
+        # Enable Target Interface
+        await tb.apply_csr_program(
+            [(regs.STBY_CR_CONTROL.base_addr, regs.STBY_CR_CONTROL.TARGET_XACT_ENABLE, 1)],
+            verify=verify,
+        )
 
     # # Enable bus
     # await tb.write_csr_field(
@@ -294,48 +290,6 @@ async def umbrella_stby_init(
     #     1,
     # )
 
-    # Check if CSRs have been set properly
-    if verify:
-        mode = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.STBY_CR_ENABLE_INIT,
-        )
-        assert mode == 2
-
-        # Set static address and valid
-        static_addr_rd = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.STATIC_ADDR,
-        )
-        assert static_addr_rd == static_addr
-
-        static_addr_valid = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR.STATIC_ADDR_VALID,
-        )
-        assert static_addr_valid == 0x1
-
-        # Set static address and valid for virtual device
-        virtual_static_addr_rd = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR,
-        )
-        assert virtual_static_addr_rd == virtual_static_addr
-
-        virtual_static_addr_valid = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR.VIRT_STATIC_ADDR_VALID,
-            0x1,
-        )
-        assert virtual_static_addr_valid == 0x1
-
-        # Enable Target Interface
-        tgt_en = await tb.read_csr_field(
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.base_addr,
-            tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_CONTROL.TARGET_XACT_ENABLE,
-        )
-        assert tgt_en == 1
-
 
 async def tti_init(tb):
     """
@@ -1,7 +1,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
-from bus2csr import get_frontend_bus_if
+from contextlib import contextmanager
+
+from bus2csr import bytes2int, get_frontend_bus_if, int2bytes
 from cocotb_helpers import reset_n
+from csr_backdoor import CSRBackdoor
 from reg_map import reg_map
 
 import cocotb
@@ -18,10 +21,104 @@ class I3CTopTestInterface:
         self.busIf = self.bus_if_cls(dut)
         self.clk = self.busIf.clk
         self.rst_n = self.busIf.rst_n
-        self.read_csr = self.busIf.read_csr
-        self.write_csr = self.busIf.write_csr
-        self.read_csr_field = self.busIf.read_csr_field
-        self.write_csr_field = self.busIf.write_csr_field
+        self.read_csr_nowait = self.busIf.read_csr_nowait
+        self.write_csr_nowait = self.busIf.write_csr_nowait
+        self.read_csr_many = self.busIf.read_csr_many
+        self.write_csr_many = self.busIf.write_csr_many
+        self.read_fifo = self.busIf.read_fifo
+        self.write_fifo = self.busIf.write_fifo
+        self.csr_cache = self.busIf.csr_cache
+        self.invalidate_csr_cache = self.busIf.invalidate_csr_cache
+
+        # CSRs are accessed through the backdoor within backdoor_access() or when requested
+        # per call, setup phases use it with +CsrBackdoor
+        self.csr_backdoor = None
+        self.setup_backdoor = "CsrBackdoor" in cocotb.plusargs
+        self._use_backdoor = False
+
+    @contextmanager
+    def backdoor_access(self, enable: bool = True):
+        """Access CSRs through the backdoor, where it's possible, within the context."""
+        prev = self._use_backdoor
+        self._use_backdoor = enable
+        try:
+            yield
+        finally:
+            self._use_backdoor = prev
+
+    def _backdoor(self, addr: int, backdoor=None):
+        """Return the backdoor if CSR at 'addr' is to be accessed through it, None otherwise."""
+        if backdoor is None:
+            backdoor = self._use_backdoor
+        if not backdoor:
+            return None
+        if self.csr_backdoor is None:
+            storage = self.dut.xi3c_wrapper.i3c.xcsri.i3c_csr.field_storage
+            self.csr_backdoor = CSRBackdoor(storage, self.clk, self.reg_map)
+        if not self.csr_backdoor.supports(addr):
+            return None
+        return self.csr_backdoor
+
+    async def read_csr(
+        self,
+        addr: int,
+        size: int = 4,
+        arid=None,
+        timeout: int = 1,
+        units: str = "us",
+        backdoor=None,
+    ):
+        if size == 4 and (csr := self._backdoor(addr, backdoor)):
+            return int2bytes(csr.read_csr(addr))
+        return await self.busIf.read_csr(addr, size, arid, timeout, units)
+
+    async def write_csr(
+        self,
+        addr: int,
+        data,
+        size: int = 4,
+        awid=None,
+        timeout: int = 1,
+        units: str = "us",
+        backdoor=None,
+    ):
+        if size == 4 and len(data) <= 4 and (csr := self._backdoor(addr, backdoor)):
+            await csr.write_csr(addr, bytes2int(data))
+            self.busIf.invalidate_csr_cache(addr)
+            return
+        return await self.busIf.write_csr(addr, data, size, awid, timeout, units)
+
+    async def read_csr_field(self, reg_addr, field, arid=None, backdoor=None) -> int:
+        if csr := self._backdoor(reg_addr, backdoor):
+            return (csr.read_csr(reg_addr) & field.mask) >> field.low
+        return await self.busIf.read_csr_field(reg_addr, field, arid)
+
+    async def write_csr_field(self, reg_addr, field, data, awid=None, backdoor=None) -> None:
+        if csr := self._backdoor(reg_addr, backdoor):
+            await csr.write_csr(reg_addr, data << field.low, field.mask)
+            self.busIf.invalidate_csr_cache(reg_addr)
+            return
+        await self.busIf.write_csr_field(reg_addr, field, data, awid)
+
+    async def apply_csr_program(self, program, verify=False, awid=None, backdoor=None) -> None:
+        """Apply the program through the backdoor if it can access all the registers,
+        through the bus otherwise."""
+        if not program or not all(self._backdoor(reg_addr, backdoor) for reg_addr, _, _ in program):
+            return await self.busIf.apply_csr_program(program, verify, awid)
+        for reg_addr, field, data in program:
+            await self.write_csr_field(reg_addr, field, data, backdoor=True)
+        if not verify:
+            return
+        # Only the last update of each field counts
+        expected = {(reg_addr, field.low): (field, data) for reg_addr, field, data in program}
+        for (reg_addr, _), (field, data) in expected.items():
+            # Write-only fields read back as zeros
+            if "r" in field.sw:
+                value = await self.read_csr_field(reg_addr, field, backdoor=True)
+                assert value == data, (
+                    f"Field {field.mask:#x} of CSR at {reg_addr:#x} differs. "
+                    f"Expected: {data:#x} Got: {value:#x}"
+                )
 
     async def setup(self, fclk=500.0):
 
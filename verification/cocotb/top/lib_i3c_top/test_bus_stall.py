@@ -5,16 +5,12 @@ import random
 
 from bus2csr import dword2int, int2dword
 from interface import I3CTopTestInterface
+from watchdog import Watchdog
 
 import cocotb
-from cocotb.triggers import Timer
 
 TRANSACTION_COUNT = 1024
 
-async def timeout_task(timeout):
-    await Timer(timeout, "us")
-    raise RuntimeError("Test timeout!")
-
 
 async def initialize(dut, fclk=333.0, timeout=50):
     """
@@ -23,11 +19,12 @@ async def initialize(dut, fclk=333.0, timeout=50):
 
     cocotb.log.setLevel(logging.DEBUG)
 
-    # Start the background timeout task
-    await cocotb.start(timeout_task(timeout))
+    # Start the background watchdog
+    watchdog = Watchdog(total=timeout).start("setup")
 
     tb = I3CTopTestInterface(dut)
     await tb.setup(fclk)
+    watchdog.phase("traffic")
     return tb
 
 
@@ -12,11 +12,13 @@ from cocotbext_i3c.i3c_controller import I3cController
 from cocotbext_i3c.i3c_recovery_interface import I3cRecoveryInterface
 from cocotbext_i3c.i3c_target import I3CTarget
 from interface import I3CTopTestInterface
+from packing import bytes2dwords, dwords2bytes
 from utils import Access, draw_axi_priv_ids, get_axi_ids_seq
+from watchdog import Watchdog
 
 import cocotb
 from cocotb.result import SimTimeoutError
-from cocotb.triggers import ClockCycles, Combine, Event, Join, RisingEdge, Timer
+from cocotb.triggers import ClockCycles, Combine, Event, Join, RisingEdge
 
 
 async def write_to_indirect_fifo(tb, data=None, awid=None, format="bytes", timeout=1, units="us"):
@@ -27,32 +29,17 @@ async def write_to_indirect_fifo(tb, data=None, awid=None, format="bytes", timeo
     if not data:
         raise ValueError("Data to write to Indirect FIFO must not be 'None'")
 
-    xfer = []
-    if format == "bytes":
-        dword = 0
-        for i, d in enumerate(data):
-            dword = dword | (d << (8 * (i % 4)))
-            if (not ((i + 1) % 4) and i) or (i == len(data) - 1):
-                xfer.append(dword)
-                dword = 0
-    else:
-        xfer.extend(data)
+    xfer = bytes2dwords(data) if format == "bytes" else list(data)
 
     # Do the I3C write transfer using the controller functionality
-    for d in xfer:
-        tb.dut._log.info(f"Writing data to TTI TX Data Queue: 0x{d:08X}")
-        await tb.write_csr(
-            tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr,
-            int2dword(d),
-            awid=awid,
-            timeout=timeout,
-            units=units,
-        )
-
-
-async def timeout_task(timeout):
-    await Timer(timeout, "us")
-    raise RuntimeError("Test timeout!")
+    tb.dut._log.info(f"Writing data to TTI TX Data Queue: {' '.join(f'0x{d:08X}' for d in xfer)}")
+    await tb.write_fifo(
+        tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr,
+        dwords2bytes(xfer),
+        awid=awid,
+        timeout=timeout,
+        units=units,
+    )
 
 
 async def initialize(dut, timeout=50):
@@ -62,8 +49,8 @@ async def initialize(dut, timeout=50):
 
     cocotb.log.setLevel(logging.DEBUG)
 
-    # Start the background timeout task
-    await cocotb.start(timeout_task(timeout))
+    # Start the background watchdog
+    watchdog = Watchdog(total=timeout).start("setup")
 
     tb = I3CTopTestInterface(dut)
     await tb.setup()
@@ -90,6 +77,7 @@ async def initialize(dut, timeout=50):
         tb.reg_map.I3C_EC.SOCMGMTIF.REC_INTF_CFG.base_addr, int2dword(enable_bypass), 4
     )
 
+    watchdog.phase("traffic")
     return tb
 
 
@@ -334,3 +334,90 @@ async def test_ec_contrl_config_csr_access(dut):
 async def test_ec_csr_access(dut):
     tb = await initialize(dut)
     await run_basic_csr_access(tb, tb.reg_map.I3C_EC)
+
+
+@cocotb.test()
+async def test_csr_cache(dut):
+    tb = await initialize(dut)
+    reg = tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR
+
+    # Count bus reads issued by the field writes
+    reads = 0
+    bus_read_csr = tb.busIf.read_csr
+
+    async def read_csr(*args, **kwargs):
+        nonlocal reads
+        reads += 1
+        return await bus_read_csr(*args, **kwargs)
+
+    tb.busIf.read_csr = read_csr
+
+    async def write_field(field, data) -> int:
+        """Write the field, return the number of bus reads it took."""
+        nonlocal reads
+        reads = 0
+        await tb.write_csr_field(reg.base_addr, field, data)
+        return reads
+
+    with tb.csr_cache(trust_hw_writable=True):
+        assert await write_field(reg.STATIC_ADDR, 0x5A) == 1
+        # Subsequent field writes skip the read of read-modify-write
+        assert await write_field(reg.STATIC_ADDR_VALID, 1) == 0
+        assert await write_field(reg.DYNAMIC_ADDR, 0x21) == 0
+        assert await tb.read_csr_field(reg.base_addr, reg.STATIC_ADDR) == 0x5A
+        assert await tb.read_csr_field(reg.base_addr, reg.STATIC_ADDR_VALID) == 1
+        assert await tb.read_csr_field(reg.base_addr, reg.DYNAMIC_ADDR) == 0x21
+
+        # Plain write invalidates the cached value
+        await tb.write_csr(reg.base_addr, int2dword(0))
+        assert await write_field(reg.DYNAMIC_ADDR, 0x21) == 1
+        assert await tb.read_csr_field(reg.base_addr, reg.STATIC_ADDR) == 0
+        assert await tb.read_csr_field(reg.base_addr, reg.DYNAMIC_ADDR) == 0x21
+
+        # So does reset
+        await reset_n(tb.clk, tb.rst_n, cycles=2)
+        assert await write_field(reg.STATIC_ADDR_VALID, 1) == 1
+        assert await tb.read_csr_field(reg.base_addr, reg.DYNAMIC_ADDR) == reg.DYNAMIC_ADDR.reset
+
+    # Without the cache every field write reads the register
+    assert await write_field(reg.STATIC_ADDR, 0x5A) == 1
+    assert await write_field(reg.STATIC_ADDR, 0x5B) == 1
+
+
+@cocotb.test()
+async def test_csr_program(dut):
+    tb = await initialize(dut)
+    addr = tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR
+    virt = tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_VIRT_DEVICE_ADDR
+
+    await tb.apply_csr_program(
+        [
+            (addr.base_addr, addr.STATIC_ADDR, 0x5A),
+            (virt.base_addr, virt.VIRT_STATIC_ADDR, 0x5B),
+            (addr.base_addr, addr.STATIC_ADDR_VALID, 1),
+            (virt.base_addr, virt.VIRT_STATIC_ADDR_VALID, 1),
+        ],
+        verify=True,
+    )
+
+    # Fields which aren't in the program are preserved
+    await tb.apply_csr_program([(addr.base_addr, addr.DYNAMIC_ADDR, 0x21)], verify=True)
+    assert await tb.read_csr_field(addr.base_addr, addr.STATIC_ADDR) == 0x5A
+    assert await tb.read_csr_field(addr.base_addr, addr.STATIC_ADDR_VALID) == 1
+    assert await tb.read_csr_field(virt.base_addr, virt.VIRT_STATIC_ADDR) == 0x5B
+
+
+@cocotb.test()
+async def test_csr_backdoor(dut):
+    tb = await initialize(dut)
+    reg = tb.reg_map.I3C_EC.STDBYCTRLMODE.STBY_CR_DEVICE_ADDR
+    wdata = int2dword(0x8021805A)
+
+    # Backdoor sees front-door writes & vice versa
+    await tb.write_csr(reg.base_addr, wdata)
+    compare_values(wdata, await tb.read_csr(reg.base_addr, backdoor=True), reg.base_addr)
+
+    with tb.backdoor_access():
+        await tb.write_csr_field(reg.base_addr, reg.STATIC_ADDR, 0x3C)
+    assert await tb.read_csr_field(reg.base_addr, reg.STATIC_ADDR) == 0x3C
+    assert await tb.read_csr_field(reg.base_addr, reg.DYNAMIC_ADDR) == 0x21
@@ -0,0 +1,20 @@
+# SPDX-License-Identifier: Apache-2.0
+
+from csr_bench import run_csr_bench
+from interface import I3CTopTestInterface
+
+import cocotb
+from cocotb.handle import SimHandleBase
+
+
+@cocotb.test()
+async def test_csr_bench(dut: SimHandleBase):
+    """Measure cost of CSR accesses through the front-end bus of the core."""
+    tb = I3CTopTestInterface(dut)
+    await tb.setup()
+
+    regs = tb.reg_map.I3C_EC.SOCMGMTIF
+    scratch = [regs.SOC_MGMT_RSVD_2.base_addr, regs.SOC_MGMT_RSVD_3.base_addr]
+    await run_csr_bench(
+        tb.busIf, scratch, fifo_write_addr=tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr
+    )
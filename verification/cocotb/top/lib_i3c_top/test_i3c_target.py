@@ -7,13 +7,15 @@ from math import ceil
 
 from boot import boot_init
 from bus2csr import dword2int, int2dword
+from cocotb_helpers import wait_for
 from cocotbext_i3c.i3c_controller import I3cController
 from cocotbext_i3c.i3c_target import I3CTarget
 from interface import I3CTopTestInterface
+from packing import bytes2dwords
 from utils import format_ibi_data, get_interrupt_status
 
 import cocotb
-from cocotb.triggers import ClockCycles, RisingEdge, Timer
+from cocotb.triggers import ClockCycles, Timer
 
 VALID_I3C_ADDRESSES = (
     [i for i in range(0x03, 0x3E)]
@@ -97,17 +99,18 @@ async def test_setup(dut, fclk=333.0, fbus=12.5, verify_boot=True,
                     dynamic_addr=dynamic_addr, virtual_dynamic_addr=virtual_dynamic_addr)
 
     # Set TTI queues thresholds
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.TTI.QUEUE_THLD_CTRL.base_addr,
-        tb.reg_map.I3C_EC.TTI.QUEUE_THLD_CTRL.RX_DESC_THLD,
-        1,
-    )
-
-    await tb.write_csr_field(
-        tb.reg_map.I3C_EC.TTI.DATA_BUFFER_THLD_CTRL.base_addr,
-        tb.reg_map.I3C_EC.TTI.DATA_BUFFER_THLD_CTRL.RX_DATA_THLD,
-        0,  # threshold = 2 ^ (x + 1) = 2
-    )
+    await tb.apply_csr_program([
+        (
+            tb.reg_map.I3C_EC.TTI.QUEUE_THLD_CTRL.base_addr,
+            tb.reg_map.I3C_EC.TTI.QUEUE_THLD_CTRL.RX_DESC_THLD,
+            1,
+        ),
+        (
+            tb.reg_map.I3C_EC.TTI.DATA_BUFFER_THLD_CTRL.base_addr,
+            tb.reg_map.I3C_EC.TTI.DATA_BUFFER_THLD_CTRL.RX_DATA_THLD,
+            0,  # threshold = 2 ^ (x + 1) = 2
+        ),
+    ])
 
     return i3c_controller, i3c_target, tb
 
@@ -136,8 +139,7 @@ async def test_i3c_target_write(dut):
 
             # Wait for the interrupt signal to go high
             irq = dut.xi3c_wrapper.i3c.irq_o
-            while irq.value == 0:
-                await RisingEdge(tb.clk)
+            await wait_for(irq, lambda value: value != 0, clk=tb.clk)
 
             # Read & check interrupt status
             intrs = await get_interrupt_status(tb)
@@ -151,15 +153,13 @@ async def test_i3c_target_write(dut):
 
             # Examine the descriptor
             assert len(tx_data) == desc_len, "Incorrect number of bytes in RX descriptor"
-            remainder = desc_len % 4
 
             err_stat = data >> 28
             assert err_stat == 0, "Unexpected error detected"
 
             # Wait for the interrupt signal to go low
             irq = dut.xi3c_wrapper.i3c.irq_o
-            while irq.value != 0:
-                await RisingEdge(tb.clk)
+            await wait_for(irq, lambda value: value == 0, clk=tb.clk)
 
             # Read & check interrupt status
             intrs = await get_interrupt_status(tb)
@@ -167,18 +167,10 @@ async def test_i3c_target_write(dut):
 
             # Read RX data
             data_len = ceil(desc_len / 4)
-            rx_data = []
-            for _ in range(data_len):
-                data = dword2int(await tb.read_csr(tb.reg_map.I3C_EC.TTI.RX_DATA_PORT.base_addr, 4))
-                for k in range(4):
-                    rx_data.append((data >> (k * 8)) & 0xFF)
+            rx_data = await tb.read_fifo(tb.reg_map.I3C_EC.TTI.RX_DATA_PORT.base_addr, data_len)
 
             # Remove entries that are outside of the data length
-            if remainder:
-                for k in range(4 - remainder):
-                    rx_data.pop()
-
-            recv_data.append(rx_data)
+            recv_data.append(rx_data[:desc_len])
 
     # Start the device firmware agent
     rx = cocotb.start_soon(rx_agent())
@@ -216,15 +208,7 @@ async def test_i3c_target_read(dut):
         dut._log.info(f"Enqueueing transfer of length {length}")
 
         # Write data to TTI TX FIFO
-        for i in range((length + 3) // 4):
-            word = data[4 * i]
-            if 4 * i + 1 < length:
-                word |= data[4 * i + 1] << 8
-            if 4 * i + 2 < length:
-                word |= data[4 * i + 2] << 16
-            if 4 * i + 3 < length:
-                word |= data[4 * i + 3] << 24
-
+        for word in bytes2dwords(data):
             await tb.write_csr(tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr, int2dword(word), 4)
 
         # Write the TX descriptor
@@ -306,15 +290,7 @@ async def test_i3c_target_read_empty(dut):
         dut._log.info(f"Enqueueing transfer of length {length}")
 
         # Write data to TTI TX FIFO
-        for i in range((length + 3) // 4):
-            word = data[4 * i]
-            if 4 * i + 1 < length:
-                word |= data[4 * i + 1] << 8
-            if 4 * i + 2 < length:
-                word |= data[4 * i + 2] << 16
-            if 4 * i + 3 < length:
-                word |= data[4 * i + 3] << 24
-
+        for word in bytes2dwords(data):
             await tb.write_csr(tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr, int2dword(word), 4)
 
         # Write the TX descriptor
@@ -364,15 +340,7 @@ async def test_i3c_target_read_to_multiple_targets(dut):
         dut._log.info(f"Enqueueing transfer of length {length}")
 
         # Write data to TTI TX FIFO
-        for i in range((length + 3) // 4):
-            word = data[4 * i]
-            if 4 * i + 1 < length:
-                word |= data[4 * i + 1] << 8
-            if 4 * i + 2 < length:
-                word |= data[4 * i + 2] << 16
-            if 4 * i + 3 < length:
-                word |= data[4 * i + 3] << 24
-
+        for word in bytes2dwords(data):
             await tb.write_csr(tb.reg_map.I3C_EC.TTI.TX_DATA_PORT.base_addr, int2dword(word), 4)
 
         # Write the TX descriptor
@@ -698,22 +666,15 @@ async def test_i3c_target_writes_and_reads(dut):
         r_data = dword2int(await tb.read_csr(tb.reg_map.I3C_EC.TTI.RX_DESC_QUEUE_PORT.base_addr, 4))
         desc_len = r_data & 0xFFFF
         assert len(test_vec) == desc_len, "Incorrect number of bytes in RX descriptor"
-        remainder = desc_len % 4
         err_stat = r_data >> 28
         assert err_stat == 0, "Unexpected error detected"
 
         # Read RX data
         data_len = ceil(desc_len / 4)
-        for _ in range(data_len):
-            r_data = dword2int(await tb.read_csr(tb.reg_map.I3C_EC.TTI.RX_DATA_PORT.base_addr, 4))
-            for k in range(4):
-                recv_xfer.append((r_data >> (k * 8)) & 0xFF)
+        recv_xfer += await tb.read_fifo(tb.reg_map.I3C_EC.TTI.RX_DATA_PORT.base_addr, data_len)
 
         # Remove entries that are outside of the data length
-        if remainder:
-            for k in range(4 - remainder):
-                recv_xfer.pop()
-        recv_data.append(recv_xfer)
+        recv_data.append(recv_xfer[:desc_len])
 
     # Compare
     dut._log.info(
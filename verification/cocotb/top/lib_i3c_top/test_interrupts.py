@@ -9,32 +9,24 @@ from cocotbext_i3c.i3c_controller import I3cController
 from cocotbext_i3c.i3c_target import I3CTarget
 from interface import I3CTopTestInterface
 from utils import format_ibi_data, get_interrupt_status
+from watchdog import Watchdog
 
 import cocotb
 from cocotb.regression import TestFactory
-from cocotb.triggers import ClockCycles, Combine, RisingEdge, Timer
+from cocotb.triggers import ClockCycles, Combine, RisingEdge
 
 # =============================================================================
 
 TARGET_ADDRESS = 0x5A
 
 
-async def timeout_task(timeout_us):
-    """
-    A generic task for handling test timeout. Waits a fixed amount of
-    simulation time and then throws an exception.
-    """
-    await Timer(timeout_us, "us")
-    raise TimeoutError("Timeout!")
-
-
 async def test_setup(dut, timeout_us=50):
     """
     Sets up controller, target models and top-level core interface
     """
 
     cocotb.log.setLevel(logging.INFO)
-    await cocotb.start(timeout_task(timeout_us))
+    watchdog = Watchdog(total=timeout_us).start("setup")
 
     i3c_controller = I3cController(
         sda_i=dut.bus_sda,
@@ -60,6 +52,7 @@ async def test_setup(dut, timeout_us=50):
     # Configure the top level
     await boot_init(tb)
 
+    watchdog.phase("traffic")
     return i3c_controller, i3c_target, tb
 
 
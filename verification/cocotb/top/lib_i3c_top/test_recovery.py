@@ -10,6 +10,7 @@ from cocotbext_i3c.i3c_controller import I3cController
 from cocotbext_i3c.i3c_recovery_interface import I3cRecoveryInterface
 from cocotbext_i3c.i3c_target import I3CTarget
 from interface import I3CTopTestInterface
+from watchdog import Watchdog
 
 import cocotb
 from cocotb.triggers import ClockCycles, Combine, Event, RisingEdge, Timer
@@ -40,11 +41,6 @@ ocp_magic_string_as_bytes = [
 ]
 
 
-async def timeout_task(timeout):
-    await Timer(timeout, "us")
-    raise RuntimeError("Test timeout!")
-
-
 async def initialize(dut, fclk=333.0, fbus=12.5, timeout=50,
                      static_addr=0x5A, virtual_static_addr=0x5B,
                      dynamic_addr=None, virtual_dynamic_addr=None):
@@ -54,8 +50,8 @@ async def initialize(dut, fclk=333.0, fbus=12.5, timeout=50,
 
     cocotb.log.setLevel(logging.DEBUG)
 
-    # Start the background timeout task
-    await cocotb.start(timeout_task(timeout))
+    # Start the background watchdog
+    watchdog = Watchdog(total=timeout).start("setup")
 
     # Initialize interfaces
     i3c_controller = I3cController(
@@ -102,12 +98,17 @@ async def initialize(dut, fclk=333.0, fbus=12.5, timeout=50,
     # Set low values to easy trigger pointer wrap in tests.
     fifo_size = 8
     xfer_size = 8
-    await tb.write_csr(
-        tb.reg_map.I3C_EC.SECFWRECOVERYIF.INDIRECT_FIFO_STATUS_3.base_addr, int2dword(fifo_size), 4
-    )
-    await tb.write_csr(
-        tb.reg_map.I3C_EC.SECFWRECOVERYIF.INDIRECT_FIFO_STATUS_4.base_addr, int2dword(xfer_size), 4
-    )
+    with tb.backdoor_access(tb.setup_backdoor):
+        await tb.write_csr(
+            tb.reg_map.I3C_EC.SECFWRECOVERYIF.INDIRECT_FIFO_STATUS_3.base_addr,
+            int2dword(fifo_size),
+            4,
+        )
+        await tb.write_csr(
+            tb.reg_map.I3C_EC.SECFWRECOVERYIF.INDIRECT_FIFO_STATUS_4.base_addr,
+            int2dword(xfer_size),
+            4,
+        )
 
     # Enable the recovery mode
     status = 0x3
@@ -115,6 +116,7 @@ async def initialize(dut, fclk=333.0, fbus=12.5, timeout=50,
         tb.reg_map.I3C_EC.SECFWRECOVERYIF.DEVICE_STATUS_0.base_addr, int2dword(status), 4
     )
 
+    watchdog.phase("traffic")
     return i3c_controller, i3c_target, tb, recovery
 
 